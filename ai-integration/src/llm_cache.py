@@ -0,0 +1,54 @@
+"""
+Simple on-disk cache for LLM responses
+Stores generated text in a JSON file so repeated prompts skip the API call
+"""
+
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+CACHE_FILE = Path("data/llm_cache.json")
+
+# Loaded lazily on first access, then kept in memory
+_cache: Optional[Dict[str, str]] = None
+# Serializes updates and file writes (summaries can be stored from several threads)
+_lock = threading.Lock()
+
+
+def _load() -> Dict[str, str]:
+    """Load the cache file into memory (only once)"""
+    global _cache
+    if _cache is None:
+        try:
+            with open(CACHE_FILE, 'r', encoding='utf-8') as f:
+                _cache = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            _cache = {}
+    return _cache
+
+
+def get(key: str) -> Optional[str]:
+    """Return the cached response for key, or None if not cached"""
+    with _lock:
+        value = _load().get(key)
+    return value if isinstance(value, str) else None
+
+
+def set(key: str, value: str) -> None:
+    """Store a response and flush the cache file atomically"""
+    with _lock:
+        cache = _load()
+        cache[key] = value
+
+        CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_file = tempfile.mkstemp(dir=CACHE_FILE.parent, suffix=".json.tmp")
+        try:
+            with open(fd, 'w', encoding='utf-8') as f:
+                json.dump(cache, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_file, CACHE_FILE)
+        except BaseException:
+            os.unlink(tmp_file)
+            raise
@@ -3,14 +3,53 @@ Simple Meeting Notes Summarizer using Google Gemini AI
 Workshop Version - Easy to understand and use
 """
 
+import asyncio
+import functools
+import hashlib
 import os
+import sys
 from pathlib import Path
+import aiofiles
 import google.generativeai as genai
 from dotenv import load_dotenv
 
+import llm_cache
+import semantic_cache
 
+MODEL_NAME = 'gemini-1.5-flash'
+
+# Notes bigger than this are uploaded to Gemini's File API instead of read into memory
+LARGE_FILE_THRESHOLD = 1_000_000
+
+# Fixed parts of the prompt, built once; only the meeting text changes per call
+_PROMPT_PREFIX = """
+    Please analyze these meeting notes and create a summary with:
+
+    1. Key Decisions (what was decided)
+    2. Action Items (who needs to do what by when)
+    3. Important Topics (main discussion points)
+    4. Next Steps (what happens next)
+
+    Meeting Notes:
+    """
+_PROMPT_SUFFIX = """
+
+    Please provide a clear, bullet-point summary:
+    """
+
+# Semantic cache entries are only reused for the same model and prompt
+_SEMANTIC_CACHE_SCOPE = hashlib.sha256(
+    f"{MODEL_NAME}\0{_PROMPT_PREFIX}\0{_PROMPT_SUFFIX}".encode()
+).hexdigest()
+
+# Markdown wrapper written around every saved summary
+_SUMMARY_HEADER = b"# AI Meeting Summary\n\n"
+_SUMMARY_FOOTER = b"\n\n---\n*Generated using Google Gemini AI*"
+
+
+@functools.lru_cache(maxsize=1)
 def setup_gemini_api():
-    """Setup Gemini API with API key from environment or user input"""
+    """Setup Gemini API with API key from environment or user input (only once per process)"""
     load_dotenv()
 
     api_key = os.getenv('GEMINI_API_KEY')
@@ -29,7 +68,7 @@ def setup_gemini_api():
 
     try:
         genai.configure(api_key=api_key)
-        model = genai.GenerativeModel('gemini-1.5-flash')
+        model = genai.GenerativeModel(MODEL_NAME)
         print("✅ Gemini API configured successfully\n")
         return model
     except Exception as e:
@@ -37,8 +76,13 @@ def setup_gemini_api():
         exit()
 
 
-def load_meeting_notes(file_path="data/meeting_notes.txt"):
-    """Load meeting notes from text file"""
+async def load_meeting_notes(file_path="data/meeting_notes.txt"):
+    """
+    Load meeting notes from text file (without blocking the event loop)
+
+    Large files are not read at all: their Path is returned and the file is
+    uploaded to Gemini directly when the summary is generated.
+    """
     try:
         file_path = Path(file_path)
 
@@ -48,8 +92,13 @@ def load_meeting_notes(file_path="data/meeting_notes.txt"):
             print(f"   {file_path.absolute()}")
             return None
 
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read().strip()
+        file_size = file_path.stat().st_size
+        if file_size > LARGE_FILE_THRESHOLD:
+            print(f"📄 Large meeting notes ({file_size / 1_000_000:.1f} MB) will be uploaded to Gemini")
+            return file_path
+
+        async with aiofiles.open(file_path, 'r', encoding='utf-8') as f:
+            content = (await f.read()).strip()
 
         if not content:
             print("❌ Meeting notes file is empty")
@@ -63,28 +112,80 @@ def load_meeting_notes(file_path="data/meeting_notes.txt"):
         return None
 
 
-def generate_summary(model, meeting_text):
-    """Generate meeting summary using Gemini"""
-    prompt = f"""
-    Please analyze these meeting notes and create a summary with:
+def build_prompt(meeting_text):
+    """Build the summarization prompt for the given meeting notes"""
+    return f"{_PROMPT_PREFIX}{meeting_text}{_PROMPT_SUFFIX}"
 
-    1. Key Decisions (what was decided)
-    2. Action Items (who needs to do what by when)
-    3. Important Topics (main discussion points)
-    4. Next Steps (what happens next)
 
-    Meeting Notes:
-    {meeting_text}
+def build_contents(meeting_text):
+    """Build the Gemini request: a prompt string, or prompt parts around an uploaded file"""
+    if isinstance(meeting_text, Path):
+        uploaded_file = genai.upload_file(meeting_text)
+        return [_PROMPT_PREFIX, uploaded_file, _PROMPT_SUFFIX]
+    return build_prompt(meeting_text)
 
-    Please provide a clear, bullet-point summary:
-    """
+
+def get_cache_key(meeting_text):
+    """Same model + same prompt gives the same summary, so key the cache on both"""
+    if isinstance(meeting_text, Path):
+        # Large file: hash it in chunks instead of reading it all into memory
+        file_hash = hashlib.sha256()
+        with open(meeting_text, 'rb') as f:
+            while chunk := f.read(1024 * 1024):
+                file_hash.update(chunk)
+        key_source = f"{MODEL_NAME}\0file:{file_hash.hexdigest()}"
+    else:
+        key_source = f"{MODEL_NAME}\0{build_prompt(meeting_text)}"
+    return hashlib.sha256(key_source.encode()).hexdigest()
+
+
+def find_similar_summary(meeting_text):
+    """Look for a cached summary of nearly identical meeting notes"""
+    # Uploaded large files are only cached by exact content
+    if not isinstance(meeting_text, str):
+        return None
+
+    try:
+        return semantic_cache.lookup(meeting_text, _SEMANTIC_CACHE_SCOPE)
+    except Exception as e:
+        print(f"⚠️  Semantic cache unavailable: {e}")
+        return None
+
+
+def remember_summary(cache_key, meeting_text, summary):
+    """Store a new summary in the exact and semantic caches (failures never lose the summary)"""
+    try:
+        llm_cache.set(cache_key, summary)
+    except Exception as e:
+        print(f"⚠️  Could not update summary cache: {e}")
+
+    if isinstance(meeting_text, str):
+        try:
+            semantic_cache.add(meeting_text, summary, _SEMANTIC_CACHE_SCOPE)
+        except Exception as e:
+            print(f"⚠️  Could not update semantic cache: {e}")
+
+
+def generate_summary(model, meeting_text):
+    """Generate meeting summary using Gemini"""
+    cache_key = get_cache_key(meeting_text)
+    cached = llm_cache.get(cache_key)
+    if cached:
+        print("⚡ Using cached summary (meeting notes unchanged)\n")
+        return cached
+
+    similar = find_similar_summary(meeting_text)
+    if similar:
+        print("⚡ Using cached summary (meeting notes nearly identical)\n")
+        return similar
 
     try:
         print("🤖 Generating AI summary...")
-        response = model.generate_content(prompt)
+        response = model.generate_content(build_contents(meeting_text))
 
         if response.text:
             print("✅ Summary generated successfully!\n")
+            remember_summary(cache_key, meeting_text, response.text)
             return response.text
         else:
             print("❌ No response from Gemini")
@@ -95,16 +196,67 @@ def generate_summary(model, meeting_text):
         return None
 
 
-def save_summary(summary, output_file="output/meeting_summary.md"):
-    """Save the summary to a markdown file"""
+async def generate_summary_async(model, meeting_text, stream_output=True):
+    """Generate meeting summary with Gemini, streaming tokens as they arrive"""
+    cache_key = await asyncio.to_thread(get_cache_key, meeting_text)
+    cached = llm_cache.get(cache_key)
+    if cached:
+        print("⚡ Using cached summary (meeting notes unchanged)\n")
+        return cached
+
+    similar = await asyncio.to_thread(find_similar_summary, meeting_text)
+    if similar:
+        print("⚡ Using cached summary (meeting notes nearly identical)\n")
+        return similar
+
+    try:
+        print("🤖 Generating AI summary (streaming)...")
+        contents = await asyncio.to_thread(build_contents, meeting_text)
+        response = await model.generate_content_async(contents, stream=True)
+
+        chunks = []
+        async for chunk in response:
+            chunks.append(chunk.text)
+            if stream_output:
+                sys.stdout.write(chunk.text)
+                sys.stdout.flush()
+
+        summary = "".join(chunks)
+        if stream_output:
+            print()
+
+        if summary:
+            print("✅ Summary generated successfully!\n")
+            await asyncio.to_thread(remember_summary, cache_key, meeting_text, summary)
+            return summary
+        else:
+            print("❌ No response from Gemini")
+            return None
+
+    except Exception as e:
+        print(f"❌ Error generating summary: {e}")
+        return None
+
+
+async def generate_summaries_batch(model, meeting_texts):
+    """Summarize several meetings concurrently (one Gemini request each)"""
+    # Streaming is turned off here so the outputs don't interleave
+    return await asyncio.gather(*[
+        generate_summary_async(model, text, stream_output=False)
+        for text in meeting_texts
+    ])
+
+
+async def save_summary(summary, output_file="output/meeting_summary.md"):
+    """Save the summary to a markdown file (without blocking the event loop)"""
     try:
         output_path = Path(output_file)
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write("# AI Meeting Summary\n\n")
-            f.write(summary)
-            f.write("\n\n---\n*Generated using Google Gemini AI*")
+        # One buffer, one write
+        payload = _SUMMARY_HEADER + summary.encode('utf-8') + _SUMMARY_FOOTER
+        async with aiofiles.open(output_path, 'wb') as f:
+            await f.write(payload)
 
         print(f"💾 Summary saved to: {output_path}")
         return True
@@ -123,7 +275,7 @@ def display_summary(summary):
     print("=" * 60)
 
 
-def main():
+async def main():
     """Main function - runs the complete summarization process"""
     print("\n🚀 Meeting Notes AI Summarizer")
     print("=" * 60)
@@ -132,7 +284,7 @@ def main():
     model = setup_gemini_api()
 
     # Step 2: Load meeting notes
-    meeting_text = load_meeting_notes()
+    meeting_text = await load_meeting_notes()
     if not meeting_text:
         return
 
@@ -145,10 +297,10 @@ def main():
     display_summary(summary)
 
     # Step 5: Save summary
-    save_summary(summary)
+    await save_summary(summary)
 
     print("\n✨ Done! Your meeting has been summarized.")
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    asyncio.run(main())
\ No newline at end of file
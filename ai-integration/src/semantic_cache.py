@@ -0,0 +1,137 @@
+"""
+Semantic cache for meeting summaries
+Reuses a summary when new meeting notes are nearly identical to ones already summarized
+(e.g. the same weekly standup with a few small edits)
+"""
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Optional
+
+import google.generativeai as genai
+import numpy as np
+
+CACHE_FILE = Path("data/semantic_cache.json")
+EMBEDDING_MODEL = "models/text-embedding-004"
+
+# Both checks must pass for a hit: embeddings say "same meaning", and the key
+# facts (every number and capitalized word, e.g. names and dates) must match
+# exactly, so swapping a name or changing a date is never a hit
+SIMILARITY_THRESHOLD = 0.95
+KEY_FACT_PATTERN = re.compile(r"\d+|\b[A-Z]\w*")
+
+# hash of scope + text -> {"scope", "text", "embedding", "summary"}; loaded lazily on first access
+_entries: Optional[Dict[str, Dict]] = None
+# Unit-length embeddings of all entries stacked into one matrix (rebuilt after add)
+_matrix: Optional[np.ndarray] = None
+_matrix_keys: list = []
+_matrix_scopes: np.ndarray = np.empty(0, dtype=object)
+# Embeddings computed in this process, so add() doesn't embed the same text twice
+_embeddings: Dict[str, np.ndarray] = {}
+# Serializes updates and file writes (summaries can be stored from several threads)
+_lock = threading.Lock()
+
+
+def _text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def _load() -> Dict[str, Dict]:
+    """Load the cache file into memory (only once)"""
+    global _entries
+    if _entries is None:
+        try:
+            with open(CACHE_FILE, 'r', encoding='utf-8') as f:
+                _entries = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            _entries = {}
+    return _entries
+
+
+def _get_matrix() -> np.ndarray:
+    """Stack all cached embeddings so one matmul scores the whole cache"""
+    global _matrix, _matrix_keys, _matrix_scopes
+    if _matrix is None:
+        entries = _load()
+        _matrix_keys = list(entries)
+        _matrix_scopes = np.array([entries[key].get("scope") for key in _matrix_keys], dtype=object)
+        if _matrix_keys:
+            _matrix = np.array([entries[key]["embedding"] for key in _matrix_keys], dtype=np.float32)
+        else:
+            _matrix = np.empty((0, 0), dtype=np.float32)
+    return _matrix
+
+
+def _embed(text: str) -> np.ndarray:
+    """Get the unit-length embedding of text (cached by SHA-256 of the text)"""
+    key = _text_hash(text)
+    if key not in _embeddings:
+        result = genai.embed_content(model=EMBEDDING_MODEL, content=text)
+        vector = np.asarray(result["embedding"], dtype=np.float32)
+        _embeddings[key] = vector / np.linalg.norm(vector)
+    return _embeddings[key]
+
+
+def _key_facts(text: str) -> Counter:
+    """Every number and capitalized word of text, with how often each appears"""
+    return Counter(KEY_FACT_PATTERN.findall(text))
+
+
+def lookup(meeting_text: str, scope: str) -> Optional[str]:
+    """
+    Return the summary of near-identical cached notes, or None
+
+    scope identifies how summaries are made (model and prompt); only entries
+    stored with the same scope can be returned.
+    """
+    with _lock:
+        matrix = _get_matrix()
+        matrix_keys = _matrix_keys
+        in_scope = _matrix_scopes == scope
+    if not in_scope.any():
+        return None
+
+    # Cosine similarity against every entry at once (all vectors are unit length)
+    scores = np.where(in_scope, matrix @ _embed(meeting_text), -1.0)
+    best = int(np.argmax(scores))
+    if scores[best] < SIMILARITY_THRESHOLD:
+        return None
+
+    with _lock:
+        entry = _load()[matrix_keys[best]]
+    if _key_facts(meeting_text) != _key_facts(entry["text"]):
+        return None
+    return entry["summary"]
+
+
+def add(meeting_text: str, summary: str, scope: str) -> None:
+    """Store a summary made in the given scope and flush the cache file atomically"""
+    global _matrix
+    # Embed outside the lock, it is a network call
+    embedding = _embed(meeting_text).tolist()
+
+    with _lock:
+        entries = _load()
+        entries[_text_hash(f"{scope}\0{meeting_text}")] = {
+            "scope": scope,
+            "text": meeting_text,
+            "embedding": embedding,
+            "summary": summary,
+        }
+        _matrix = None
+
+        CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_file = tempfile.mkstemp(dir=CACHE_FILE.parent, suffix=".json.tmp")
+        try:
+            with open(fd, 'w', encoding='utf-8') as f:
+                json.dump(entries, f, ensure_ascii=False)
+            os.replace(tmp_file, CACHE_FILE)
+        except BaseException:
+            os.unlink(tmp_file)
+            raise
@@ -3,10 +3,17 @@ Simple Authentication API
 Login and logout endpoints with dummy user data
 """
 
-from datetime import datetime, timedelta
-from typing import Dict, Optional
+from collections import deque
+from datetime import datetime
+from typing import Deque, Dict, List, Optional, Tuple
 from fastapi import HTTPException, status
+import base64
+import functools
+import hashlib
+import heapq
+import os
 import secrets
+import time
 
 # Dummy user database
 DUMMY_USERS = {
@@ -33,9 +40,29 @@ DUMMY_USERS = {
     }
 }
 
+# Password digests precomputed once so login is a dict lookup + constant-time compare
+_USER_PW_DIGEST: Dict[str, bytes] = {
+    username: hashlib.sha256(user["password"].encode()).digest()
+    for username, user in DUMMY_USERS.items()
+}
+
 # Active sessions storage (in real apps, use Redis or database)
 ACTIVE_SESSIONS: Dict[str, Dict] = {}
 
+# Sessions last 24 hours
+SESSION_LIFETIME_SECONDS = 24 * 60 * 60
+
+# Min-heap of (expires_at, token) so expired sessions can be found without a full scan
+_expiry_heap: List[Tuple[float, str]] = []
+
+# Pre-generated session tokens: one os.urandom call fills the pool for many logins
+TOKEN_BYTES = 32
+TOKEN_POOL_SIZE = 256
+_TOKEN_POOL: Deque[str] = deque()
+
+# Bumped on every revoke so cached token verifications are dropped immediately
+_session_generation = 0
+
 
 def authenticate_user(username: str, password: str) -> Optional[Dict]:
     """
@@ -48,12 +75,24 @@ def authenticate_user(username: str, password: str) -> Optional[Dict]:
     Returns:
         User data if authentication successful, None otherwise
     """
-    user = DUMMY_USERS.get(username)
-    if user and user["password"] == password:
-        return user
+    digest = _USER_PW_DIGEST.get(username)
+    if digest is None:
+        return None
+
+    if secrets.compare_digest(digest, hashlib.sha256(password.encode()).digest()):
+        return DUMMY_USERS[username]
     return None
 
 
+def _refill_tokens() -> None:
+    """Fill the token pool from a single os.urandom read"""
+    buf = os.urandom(TOKEN_BYTES * TOKEN_POOL_SIZE)
+    for i in range(0, len(buf), TOKEN_BYTES):
+        # Same format as secrets.token_urlsafe(TOKEN_BYTES)
+        token = base64.urlsafe_b64encode(buf[i:i + TOKEN_BYTES]).rstrip(b"=").decode("ascii")
+        _TOKEN_POOL.append(token)
+
+
 def create_session(user_data: Dict) -> str:
     """
     Create a new session for authenticated user
@@ -64,22 +103,36 @@ def create_session(user_data: Dict) -> str:
     Returns:
         Session token
     """
-    # Generate random session token
-    session_token = secrets.token_urlsafe(32)
-
-    # Store session data
+    # Take a random session token from the pool
+    if not _TOKEN_POOL:
+        _refill_tokens()
+    session_token = _TOKEN_POOL.popleft()
+
+    # Store session data. expires_at is a time.monotonic() deadline: cheaper to
+    # compare than datetimes and unaffected by wall-clock changes
+    expires_at = time.monotonic() + SESSION_LIFETIME_SECONDS
     ACTIVE_SESSIONS[session_token] = {
         "user_id": user_data["id"],
         "username": user_data["username"],
         "email": user_data["email"],
         "full_name": user_data["full_name"],
         "login_time": datetime.now(),
-        "expires_at": datetime.now() + timedelta(hours=24)
+        "expires_at": expires_at
     }
+    heapq.heappush(_expiry_heap, (expires_at, session_token))
 
     return session_token
 
 
+def purge_expired_sessions() -> None:
+    """Remove expired sessions, oldest first, stopping at the first unexpired one"""
+    current_time = time.monotonic()
+    while _expiry_heap and _expiry_heap[0][0] < current_time:
+        _, token = heapq.heappop(_expiry_heap)
+        # Revoked sessions leave stale heap entries; pop(..., None) skips them
+        ACTIVE_SESSIONS.pop(token, None)
+
+
 def get_session(session_token: str) -> Optional[Dict]:
     """
     Get session data by token
@@ -90,17 +143,9 @@ def get_session(session_token: str) -> Optional[Dict]:
     Returns:
         Session data if valid, None otherwise
     """
-    session = ACTIVE_SESSIONS.get(session_token)
-    if not session:
-        return None
-
-    # Check if session expired
-    if datetime.now() > session["expires_at"]:
-        # Remove expired session
-        del ACTIVE_SESSIONS[session_token]
-        return None
-
-    return session
+    # Drop expired sessions (including this one, if it has expired)
+    purge_expired_sessions()
+    return ACTIVE_SESSIONS.get(session_token)
 
 
 def revoke_session(session_token: str) -> bool:
@@ -113,8 +158,10 @@ def revoke_session(session_token: str) -> bool:
     Returns:
         True if session was revoked, False if not found
     """
+    global _session_generation
     if session_token in ACTIVE_SESSIONS:
         del ACTIVE_SESSIONS[session_token]
+        _session_generation += 1
         return True
     return False
 
@@ -122,15 +169,7 @@ def revoke_session(session_token: str) -> bool:
 def get_active_sessions_count() -> int:
     """Get count of active sessions"""
     # Clean expired sessions first
-    current_time = datetime.now()
-    expired_tokens = [
-        token for token, session in ACTIVE_SESSIONS.items()
-        if current_time > session["expires_at"]
-    ]
-
-    for token in expired_tokens:
-        del ACTIVE_SESSIONS[token]
-
+    purge_expired_sessions()
     return len(ACTIVE_SESSIONS)
 
 
@@ -154,4 +193,27 @@ def verify_session_token(token: str) -> Dict:
             detail="Invalid or expired session token",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    return session
\ No newline at end of file
+    return session
+
+
+@functools.lru_cache(maxsize=1024)
+def _verify_with_bucket(token: str, bucket: int, generation: int) -> Dict:
+    """Cached verify_session_token; bucket and generation are only part of the cache key"""
+    return verify_session_token(token)
+
+
+def verify_session_token_cached(token: str) -> Dict:
+    """
+    Verify session token, reusing the result if the same token was checked
+    within the current second
+
+    Args:
+        token: Session token to verify
+
+    Returns:
+        User session data
+
+    Raises:
+        HTTPException: If token is invalid or expired (failures are never cached)
+    """
+    return _verify_with_bucket(token, int(time.monotonic()), _session_generation)
\ No newline at end of file
@@ -3,8 +3,9 @@ In-memory database for Employee API
 Simple storage that can be easily replaced with SQLAlchemy later
 """
 
-from typing import Dict, List, Optional
-from models import Employee, EmployeeCreate, EmployeeUpdate
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional, Set, Tuple
+from models import Employee, EmployeeCreate, EmployeeRole, EmployeeUpdate
 import threading
 
 class EmployeeDatabase:
@@ -14,6 +15,13 @@ class EmployeeDatabase:
         self._employees: Dict[int, Employee] = {}
         self._next_id = 1
         self._lock = threading.Lock()
+        # Cached read-only view of all employees, rebuilt lazily after writes
+        self._snapshot: Optional[Tuple[Employee, ...]] = None
+        # Secondary index: role -> employee IDs, plus per-role counts for stats
+        self._by_role: Dict[EmployeeRole, Set[int]] = defaultdict(set)
+        self._role_counts: Counter = Counter()
+        # Bumped on every write so callers can tell when cached reads are stale
+        self._version = 0
         
         # Add some sample data
         self._init_sample_data()
@@ -39,16 +47,27 @@ class EmployeeDatabase:
                 email=employee_data.email
             )
             self._employees[self._next_id] = employee
+            self._by_role[employee.role].add(employee.id)
+            self._role_counts[employee.role] += 1
             self._next_id += 1
+            self._version += 1
+            self._snapshot = None
             return employee
     
     def get_employee(self, employee_id: int) -> Optional[Employee]:
         """Get employee by ID"""
         return self._employees.get(employee_id)
     
-    def get_all_employees(self) -> List[Employee]:
-        """Get all employees"""
-        return list(self._employees.values())
+    def get_all_employees(self) -> Tuple[Employee, ...]:
+        """Get all employees (cached until the next write)"""
+        snapshot = self._snapshot
+        if snapshot is None:
+            # Rebuild under the write lock so a concurrent write can't leave a stale snapshot
+            with self._lock:
+                snapshot = self._snapshot
+                if snapshot is None:
+                    snapshot = self._snapshot = tuple(self._employees.values())
+        return snapshot
     
     def update_employee(self, employee_id: int, employee_data: EmployeeUpdate) -> Optional[Employee]:
         """Update an existing employee"""
@@ -58,24 +77,32 @@ class EmployeeDatabase:
             
             current_employee = self._employees[employee_id]
             
-            # Update only provided fields
-            update_data = employee_data.model_dump(exclude_unset=True)
+            # Update only provided fields. The values were already validated by
+            # EmployeeUpdate, so copy instead of re-validating a whole new Employee
+            # (explicit nulls are skipped so required fields can't become None)
+            update_data = employee_data.model_dump(exclude_unset=True, exclude_none=True)
+            updated_employee = current_employee.model_copy(update=update_data)
             
-            updated_employee = Employee(
-                id=employee_id,
-                name=update_data.get('name', current_employee.name),
-                role=update_data.get('role', current_employee.role),
-                email=update_data.get('email', current_employee.email)
-            )
+            if updated_employee.role != current_employee.role:
+                self._by_role[current_employee.role].discard(employee_id)
+                self._role_counts[current_employee.role] -= 1
+                self._by_role[updated_employee.role].add(employee_id)
+                self._role_counts[updated_employee.role] += 1
             
             self._employees[employee_id] = updated_employee
+            self._version += 1
+            self._snapshot = None
             return updated_employee
     
     def delete_employee(self, employee_id: int) -> bool:
         """Delete an employee"""
         with self._lock:
             if employee_id in self._employees:
-                del self._employees[employee_id]
+                employee = self._employees.pop(employee_id)
+                self._by_role[employee.role].discard(employee_id)
+                self._role_counts[employee.role] -= 1
+                self._version += 1
+                self._snapshot = None
                 return True
             return False
     
@@ -86,6 +113,20 @@ class EmployeeDatabase:
     def get_employee_count(self) -> int:
         """Get total number of employees"""
         return len(self._employees)
+    
+    def get_version(self) -> int:
+        """Get the data version (changes after every create/update/delete)"""
+        return self._version
+    
+    def get_employees_by_role(self, role: EmployeeRole) -> List[Employee]:
+        """Get employees with the given role (ordered by ID)"""
+        with self._lock:
+            return [self._employees[i] for i in sorted(self._by_role.get(role, ()))]
+    
+    def get_role_counts(self) -> Dict[EmployeeRole, int]:
+        """Get number of employees per role (roles with no employees are left out)"""
+        with self._lock:
+            return {role: count for role, count in self._role_counts.items() if count > 0}
 
 # Global database instance
 db = EmployeeDatabase()
\ No newline at end of file
@@ -3,11 +3,21 @@ Simple Authentication API
 FastAPI application with login and logout endpoints using dummy user data
 """
 
-from typing import Optional
-
-from fastapi import Depends, FastAPI, Header, HTTPException, status
-
-from auth import authenticate_user, create_session, revoke_session, verify_session_token
+import asyncio
+import hashlib
+from contextlib import asynccontextmanager
+from typing import Optional, Tuple
+
+from fastapi import Depends, FastAPI, Header, HTTPException, Request, Response, status
+from fastapi.responses import ORJSONResponse
+
+from auth import (
+    authenticate_user,
+    create_session,
+    purge_expired_sessions,
+    revoke_session,
+    verify_session_token_cached
+)
 from database import db
 from models import (
     APIResponse,
@@ -22,19 +32,42 @@ from models import (
     UserProfile
 )
 
+# How often expired sessions are removed in the background
+SESSION_SWEEP_INTERVAL_SECONDS = 60
+
+
+async def _session_sweeper():
+    """Periodically drop expired sessions, even ones that are never used again"""
+    while True:
+        await asyncio.sleep(SESSION_SWEEP_INTERVAL_SECONDS)
+        purge_expired_sessions()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Run the session sweeper for as long as the app is running"""
+    sweeper = asyncio.create_task(_session_sweeper())
+    yield
+    sweeper.cancel()
+
+
 # Create FastAPI app
 app = FastAPI(
     title="Simple Authentication API",
     description="A basic authentication API with login/logout functionality using dummy data",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
+# Serialized GET /employees body as (db version, JSON bytes, ETag)
+_employees_cache: Optional[Tuple[int, bytes, str]] = None
 
-# Authentication dependency
-async def get_current_user(authorization: Optional[str] = Header(None)) -> dict:
-    """Get current authenticated user from session token"""
+
+def _extract_bearer(authorization: Optional[str]) -> str:
+    """Return the token from a "Bearer <token>" header or raise 401"""
     if not authorization or not authorization.startswith("Bearer "):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -42,8 +75,15 @@ async def get_current_user(authorization: Optional[str] = Header(None)) -> dict:
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    token = authorization.split(" ")[1]
-    return verify_session_token(token)
+    # Slice off the "Bearer " prefix (no split/list allocation)
+    return authorization[7:]
+
+
+# Authentication dependency
+async def get_current_user(authorization: Optional[str] = Header(None)) -> dict:
+    """Get current authenticated user from session token"""
+    token = _extract_bearer(authorization)
+    return verify_session_token_cached(token)
 
 
 # Authentication Endpoints
@@ -76,13 +116,7 @@ async def login(login_request: LoginRequest):
 @app.post("/auth/logout", response_model=LogoutResponse)
 async def logout(authorization: Optional[str] = Header(None)):
     """Logout and revoke session token"""
-    if not authorization or not authorization.startswith("Bearer "):
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Missing or invalid authorization header"
-        )
-
-    token = authorization.split(" ")[1]
+    token = _extract_bearer(authorization)
     success = revoke_session(token)
 
     if not success:
@@ -134,14 +168,31 @@ async def create_employee(
 
 
 @app.get("/employees", response_model=EmployeeList)
-async def get_all_employees(current_user: dict = Depends(get_current_user)):
+async def get_all_employees(
+    request: Request,
+    current_user: dict = Depends(get_current_user)
+):
     """
     Retrieve all employees (requires authentication)
 
-    Returns a list of all employees in the system
+    Returns a list of all employees in the system. The response carries an ETag;
+    send it back in If-None-Match to get 304 Not Modified when nothing changed.
     """
-    employees = db.get_all_employees()
-    return EmployeeList(employees=employees, total=len(employees))
+    global _employees_cache
+
+    # Only serialize again when the database has changed since the last request
+    version = db.get_version()
+    if _employees_cache is None or _employees_cache[0] != version:
+        employees = db.get_all_employees()
+        body = EmployeeList(employees=employees, total=len(employees)).model_dump_json().encode()
+        etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+        _employees_cache = (version, body, etag)
+
+    _, body, etag = _employees_cache
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
 
 
 @app.get("/employees/{employee_id}", response_model=Employee)
@@ -234,8 +285,13 @@ async def get_employees_by_role(
 
     - **role**: The role to filter by
     """
-    all_employees = db.get_all_employees()
-    filtered_employees = [emp for emp in all_employees if emp.role.value == role]
+    try:
+        employee_role = EmployeeRole(role)
+    except ValueError:
+        # Unknown role: nobody can have it
+        return EmployeeList(employees=[], total=0)
+
+    filtered_employees = db.get_employees_by_role(employee_role)
 
     return EmployeeList(employees=filtered_employees, total=len(filtered_employees))
 
@@ -247,22 +303,23 @@ async def get_employee_stats(current_user: dict = Depends(get_current_user)):
 
     Returns statistics about employees by role
     """
-    employees = db.get_all_employees()
+    total_employees = db.get_employee_count()
 
-    # Count by role
-    role_counts = {}
-    for emp in employees:
-        role = emp.role.value
-        role_counts[role] = role_counts.get(role, 0) + 1
+    # Count by role (maintained by the database on every write)
+    role_counts = {role.value: count for role, count in db.get_role_counts().items()}
 
     return {
-        "total_employees": len(employees),
+        "total_employees": total_employees,
         "employees_by_role": role_counts,
-        "available_roles": [role.value for role in EmployeeRole] if employees else []
+        "available_roles": [role.value for role in EmployeeRole] if total_employees else []
     }
 
 
 if __name__ == "__main__":
+    import sys
+
     import uvicorn
 
-    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
+    # uvloop (libuv-based event loop) is faster than asyncio's default loop but has no Windows build
+    loop = "asyncio" if sys.platform == "win32" else "uvloop"
+    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True, loop=loop, http="httptools")
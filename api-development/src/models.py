@@ -2,7 +2,7 @@
 Pydantic models for Authentication API and Employee Management
 """
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import Optional, List
 from datetime import datetime
 from enum import Enum
@@ -13,13 +13,14 @@ class LoginRequest(BaseModel):
     username: str
     password: str
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "username": "admin",
                 "password": "admin123"
             }
         }
+    )
 
 
 class LoginResponse(BaseModel):
@@ -29,8 +30,8 @@ class LoginResponse(BaseModel):
     session_token: str
     user: dict
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "success": True,
                 "message": "Login successful",
@@ -43,6 +44,7 @@ class LoginResponse(BaseModel):
                 }
             }
         }
+    )
 
 
 class LogoutResponse(BaseModel):
@@ -50,13 +52,14 @@ class LogoutResponse(BaseModel):
     success: bool
     message: str
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "success": True,
                 "message": "Logout successful"
             }
         }
+    )
 
 
 class UserProfile(BaseModel):
@@ -67,8 +70,8 @@ class UserProfile(BaseModel):
     full_name: str
     login_time: datetime
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "id": 1,
                 "username": "admin",
@@ -77,6 +80,7 @@ class UserProfile(BaseModel):
                 "login_time": "2024-01-15T10:30:00"
             }
         }
+    )
 
 
 class APIResponse(BaseModel):
@@ -85,14 +89,15 @@ class APIResponse(BaseModel):
     message: str
     data: Optional[dict] = None
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "success": True,
                 "message": "Operation successful",
                 "data": {}
             }
         }
+    )
 
 
 # Employee Management Models
@@ -112,14 +117,15 @@ class EmployeeCreate(BaseModel):
     role: EmployeeRole
     email: str
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "name": "John Doe",
                 "role": "Developer",
                 "email": "john.doe@company.com"
             }
         }
+    )
 
 
 class EmployeeUpdate(BaseModel):
@@ -128,25 +134,27 @@ class EmployeeUpdate(BaseModel):
     role: Optional[EmployeeRole] = None
     email: Optional[str] = None
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "name": "Jane Smith",
                 "role": "Manager",
                 "email": "jane.smith@company.com"
             }
         }
+    )
 
 
 class Employee(BaseModel):
-    """Employee model"""
+    """Employee model (immutable - updates create a copy)"""
     id: int
     name: str
     role: EmployeeRole
     email: str
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        frozen=True,
+        json_schema_extra={
             "example": {
                 "id": 1,
                 "name": "John Doe",
@@ -154,6 +162,7 @@ class Employee(BaseModel):
                 "email": "john.doe@company.com"
             }
         }
+    )
 
 
 class EmployeeList(BaseModel):
@@ -161,8 +170,8 @@ class EmployeeList(BaseModel):
     employees: List[Employee]
     total: int
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "employees": [
                     {
@@ -174,4 +183,5 @@ class EmployeeList(BaseModel):
                 ],
                 "total": 1
             }
-        }
\ No newline at end of file
+        }
+    )
\ No newline at end of file
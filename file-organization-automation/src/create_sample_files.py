@@ -5,8 +5,36 @@ Creates various file types with different naming patterns and dates
 
 import os
 import random
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
+from typing import List, NamedTuple, Optional
+
+# Minimal "magic number" headers so the sample files look like the real formats
+IMAGE_HEADERS = {
+    '.jpg': b'\xff\xd8\xff\xe0',  # JPEG header
+    '.jpeg': b'\xff\xd8\xff\xe0',
+    '.png': b'\x89PNG\r\n\x1a\n',  # PNG header
+}
+MEDIA_HEADERS = {
+    '.mp4': b'ftypisom',  # MP4 header
+    '.avi': b'RIFF....AVI ',  # AVI header
+    '.mp3': b'ID3',  # MP3 header
+}
+ARCHIVE_HEADERS = {
+    '.zip': b'PK\x03\x04',  # ZIP header
+    '.rar': b'Rar!\x1a\x07\x00',  # RAR header
+}
+
+# Files are independent, so they are written in parallel
+MAX_WRITE_WORKERS = 16
+
+
+class SampleFile(NamedTuple):
+    """A sample file to write: path, content and optional modification time"""
+    path: Path
+    content: bytes
+    mtime: Optional[float] = None
 
 
 class SampleFileCreator:
@@ -16,10 +44,25 @@ class SampleFileCreator:
         self.base_path = Path(base_path)
         self.base_path.mkdir(exist_ok=True)
 
-    def create_sample_documents(self):
-        """Create sample document files with various formats"""
-        print("Creating sample documents...")
-
+    def _write_sample(self, sample: SampleFile) -> bool:
+        """Write one sample file (and set its modification time if given)"""
+        try:
+            sample.path.write_bytes(sample.content)
+            if sample.mtime is not None:
+                os.utime(sample.path, (sample.mtime, sample.mtime))
+        except OSError as e:
+            # e.g. filenames with characters the OS doesn't allow; report why
+            print(f"Skipped {sample.path.name}: {e}")
+            return False
+        return True
+
+    def _write_all(self, samples: List[SampleFile]) -> int:
+        """Write sample files using a thread pool, returns how many were written"""
+        with ThreadPoolExecutor(max_workers=MAX_WRITE_WORKERS) as executor:
+            return sum(executor.map(self._write_sample, samples))
+
+    def _sample_documents(self) -> List[SampleFile]:
+        """Sample document files with various formats"""
         documents = [
             # PDF files
             "Invoice_2024_001.pdf",
@@ -47,18 +90,16 @@ class SampleFileCreator:
             "readme_project_info.txt"
         ]
 
-        for doc in documents:
-            file_path = self.base_path / doc
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(f"Sample content for {doc}\nCreated on: {datetime.now()}\n")
-                f.write("This is a test file for file organization automation.\n")
-
-        print(f"Created {len(documents)} document files")
-
-    def create_sample_images(self):
-        """Create sample image files with various formats"""
-        print("Creating sample images...")
+        # Shared part of the content is built once, each file is a single write
+        created_on = f"Created on: {datetime.now()}\n".encode()
+        payload = created_on + b"This is a test file for file organization automation.\n"
+        return [
+            SampleFile(self.base_path / doc, f"Sample content for {doc}\n".encode() + payload)
+            for doc in documents
+        ]
 
+    def _sample_images(self) -> List[SampleFile]:
+        """Sample image files with various formats"""
         images = [
             # Photos with dates
             "IMG_20240315_143022.jpg",
@@ -75,22 +116,17 @@ class SampleFileCreator:
             "mockup_mobile_app.jpg"
         ]
 
-        for img in images:
-            file_path = self.base_path / img
-            with open(file_path, 'wb') as f:
-                # Create a minimal file (just header bytes for different formats)
-                if img.endswith('.jpg') or img.endswith('.jpeg'):
-                    f.write(b'\xff\xd8\xff\xe0')  # JPEG header
-                elif img.endswith('.png'):
-                    f.write(b'\x89PNG\r\n\x1a\n')  # PNG header
-                f.write(f"Sample image data for {img}".encode())
-
-        print(f"Created {len(images)} image files")
-
-    def create_sample_media(self):
-        """Create sample media files (video/audio)"""
-        print("Creating sample media files...")
+        # Create a minimal file (just header bytes for different formats)
+        return [
+            SampleFile(
+                self.base_path / img,
+                IMAGE_HEADERS.get(Path(img).suffix, b'') + f"Sample image data for {img}".encode()
+            )
+            for img in images
+        ]
 
+    def _sample_media(self) -> List[SampleFile]:
+        """Sample media files (video/audio)"""
         media = [
             # Video files
             "presentation_demo_2024.mp4",
@@ -105,24 +141,17 @@ class SampleFileCreator:
             "voicemail_important_call.mp3"
         ]
 
-        for media_file in media:
-            file_path = self.base_path / media_file
-            with open(file_path, 'wb') as f:
-                # Create minimal headers for different media formats
-                if media_file.endswith('.mp4'):
-                    f.write(b'ftypisom')  # MP4 header
-                elif media_file.endswith('.avi'):
-                    f.write(b'RIFF....AVI ')  # AVI header
-                elif media_file.endswith('.mp3'):
-                    f.write(b'ID3')  # MP3 header
-                f.write(f"Sample media data for {media_file}".encode())
-
-        print(f"Created {len(media)} media files")
-
-    def create_sample_archives(self):
-        """Create sample archive files"""
-        print("Creating sample archive files...")
+        # Create minimal headers for different media formats
+        return [
+            SampleFile(
+                self.base_path / media_file,
+                MEDIA_HEADERS.get(Path(media_file).suffix, b'') + f"Sample media data for {media_file}".encode()
+            )
+            for media_file in media
+        ]
 
+    def _sample_archives(self) -> List[SampleFile]:
+        """Sample archive files"""
         archives = [
             "backup_database_20240315.zip",
             "project_source_code.tar.gz",
@@ -131,21 +160,18 @@ class SampleFileCreator:
             "software_installer_v2.1.zip"
         ]
 
-        for archive in archives:
-            file_path = self.base_path / archive
-            with open(file_path, 'wb') as f:
-                # Create minimal archive headers
-                if archive.endswith('.zip'):
-                    f.write(b'PK\x03\x04')  # ZIP header
-                elif archive.endswith('.rar'):
-                    f.write(b'Rar!\x1a\x07\x00')  # RAR header
-                f.write(f"Sample archive data for {archive}".encode())
-
-        print(f"Created {len(archives)} archive files")
+        # Create minimal archive headers
+        return [
+            SampleFile(
+                self.base_path / archive,
+                ARCHIVE_HEADERS.get(Path(archive).suffix, b'') + f"Sample archive data for {archive}".encode()
+            )
+            for archive in archives
+        ]
 
-    def create_files_with_dates(self):
-        """Create files with various modification dates"""
-        print("Creating files with different modification dates...")
+    def _files_with_dates(self) -> List[SampleFile]:
+        """Sample files with various modification dates"""
+        samples = []
 
         # Create files with dates from the past year
         for i in range(10):
@@ -153,23 +179,17 @@ class SampleFileCreator:
             past_date = datetime.now() - timedelta(days=days_ago)
 
             filename = f"old_file_{past_date.strftime('%Y%m%d')}_{i+1}.txt"
-            file_path = self.base_path / filename
-
-            with open(file_path, 'w') as f:
-                f.write(f"File created on: {past_date}\nThis is file number {i+1}")
-
-            # Set the file's modification time
-            timestamp = past_date.timestamp()
-            os.utime(file_path, (timestamp, timestamp))
+            content = f"File created on: {past_date}\nThis is file number {i+1}".encode()
 
-        print("Created 10 files with historical dates")
+            # The file's modification time is set to the past date
+            samples.append(SampleFile(self.base_path / filename, content, past_date.timestamp()))
 
-    def create_duplicate_files(self):
-        """Create duplicate files for testing duplicate detection"""
-        print("Creating duplicate files...")
+        return samples
 
+    def _duplicate_files(self) -> List[SampleFile]:
+        """Duplicate files for testing duplicate detection"""
         # Create original file
-        original_content = "This is the original file content for duplicate testing."
+        original_content = b"This is the original file content for duplicate testing."
 
         duplicates = [
             "original_document.txt",
@@ -179,17 +199,11 @@ class SampleFileCreator:
             "another_copy_of_original.txt"
         ]
 
-        for dup in duplicates:
-            file_path = self.base_path / dup
-            with open(file_path, 'w') as f:
-                f.write(original_content)  # Same content = duplicates
-
-        print(f"Created {len(duplicates)} duplicate files")
-
-    def create_messy_filenames(self):
-        """Create files with messy/inconsistent naming"""
-        print("Creating files with messy naming patterns...")
+        # Same content = duplicates
+        return [SampleFile(self.base_path / dup, original_content) for dup in duplicates]
 
+    def _messy_filenames(self) -> List[SampleFile]:
+        """Files with messy/inconsistent naming"""
         messy_files = [
             "Document without extension",
             "FILE WITH SPACES AND CAPS.TXT",
@@ -201,16 +215,51 @@ class SampleFileCreator:
             "file(with)parentheses[and]brackets.jpg"
         ]
 
-        for messy in messy_files:
-            file_path = self.base_path / messy
-            try:
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(f"Content for messy filename: {messy}")
-            except OSError:
-                # Skip files with invalid characters for the OS
-                print(f"Skipped invalid filename: {messy}")
-                continue
+        return [
+            SampleFile(self.base_path / messy, f"Content for messy filename: {messy}".encode('utf-8'))
+            for messy in messy_files
+        ]
+
+    def create_sample_documents(self):
+        """Create sample document files with various formats"""
+        print("Creating sample documents...")
+        created = self._write_all(self._sample_documents())
+        print(f"Created {created} document files")
+
+    def create_sample_images(self):
+        """Create sample image files with various formats"""
+        print("Creating sample images...")
+        created = self._write_all(self._sample_images())
+        print(f"Created {created} image files")
+
+    def create_sample_media(self):
+        """Create sample media files (video/audio)"""
+        print("Creating sample media files...")
+        created = self._write_all(self._sample_media())
+        print(f"Created {created} media files")
+
+    def create_sample_archives(self):
+        """Create sample archive files"""
+        print("Creating sample archive files...")
+        created = self._write_all(self._sample_archives())
+        print(f"Created {created} archive files")
+
+    def create_files_with_dates(self):
+        """Create files with various modification dates"""
+        print("Creating files with different modification dates...")
+        created = self._write_all(self._files_with_dates())
+        print(f"Created {created} files with historical dates")
+
+    def create_duplicate_files(self):
+        """Create duplicate files for testing duplicate detection"""
+        print("Creating duplicate files...")
+        created = self._write_all(self._duplicate_files())
+        print(f"Created {created} duplicate files")
 
+    def create_messy_filenames(self):
+        """Create files with messy/inconsistent naming"""
+        print("Creating files with messy naming patterns...")
+        self._write_all(self._messy_filenames())
         print("Created files with messy naming patterns")
 
     def create_all_samples(self):
@@ -218,17 +267,27 @@ class SampleFileCreator:
         print("CREATING SAMPLE FILES FOR FILE ORGANIZATION TESTING")
         print("=" * 60)
 
-        self.create_sample_documents()
-        self.create_sample_images()
-        self.create_sample_media()
-        self.create_sample_archives()
-        self.create_files_with_dates()
-        self.create_duplicate_files()
-        self.create_messy_filenames()
-
-        # Count total files created
-        total_files = len(list(self.base_path.glob('*')))
-        total_size = sum(f.stat().st_size for f in self.base_path.glob('*') if f.is_file())
+        # Collect every category first, then write them all in one thread pool
+        samples = (
+            self._sample_documents()
+            + self._sample_images()
+            + self._sample_media()
+            + self._sample_archives()
+            + self._files_with_dates()
+            + self._duplicate_files()
+            + self._messy_filenames()
+        )
+        print(f"Writing {len(samples)} sample files...")
+        self._write_all(samples)
+
+        # Count total files and size in a single directory pass
+        total_files = 0
+        total_size = 0
+        with os.scandir(self.base_path) as entries:
+            for entry in entries:
+                total_files += 1
+                if entry.is_file():
+                    total_size += entry.stat().st_size
 
         print("\n" + "=" * 60)
         print("SAMPLE FILE CREATION COMPLETED!")
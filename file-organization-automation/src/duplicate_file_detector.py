@@ -3,20 +3,111 @@ Duplicate File Detector - Find and manage duplicate files
 Uses file content hashing to identify exact duplicates
 """
 
+import functools
 import hashlib
-from collections import defaultdict
+import io
+import mmap
+import multiprocessing
+import os
+import sys
+import time
+from collections import defaultdict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from operator import attrgetter
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Optional, Tuple
 
 import send2trash
 
+# Compact per-file record (much smaller than a dict per file on large scans)
+FileInfo = namedtuple('FileInfo', 'path size mtime')
+
+# BLAKE3 (SIMD-accelerated) when the optional blake3 package is installed, otherwise SHA-256
+try:
+    from blake3 import blake3 as _file_hasher
+except ImportError:
+    _file_hasher = hashlib.sha256
+
+# Non-cryptographic hash for the quick pre-filter: xxh3 when the optional xxhash
+# package is installed, otherwise CRC32. Collisions only cost an extra full hash.
+try:
+    from xxhash import xxh3_64_intdigest as _quick_digest
+except ImportError:
+    from zlib import crc32 as _quick_digest
+
+# Read size for full-file hashing: few large reads instead of many small ones
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# Files larger than this are memory-mapped and hashed without copying into Python
+MMAP_MIN_SIZE = 4 * 1024 * 1024
+
+# Bytes read per file for the quick pre-filter hash
+QUICK_HASH_BYTES = 4096
+
+# Upper bound on bytes queued for kernel readahead before full hashing
+PREFETCH_MAX_BYTES = 256 * 1024 * 1024
+
+# Hash in a thread pool only when there are enough files to be worth it
+PARALLEL_MIN_FILES = 32
+MAX_HASH_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# Trashing a file is mostly waiting on the filesystem, so deletions run in threads
+DELETE_WORKERS = 8
+
+# Full hashing starts in threads on this many files to measure throughput
+PROCESS_POOL_PROBE_FILES = 100
+# Faster than this (bytes/s), the data is coming from the page cache and hashing
+# is CPU-bound, so the remaining files are spread over worker processes
+CPU_BOUND_MIN_THROUGHPUT = 1024 * 1024 * 1024
+
+
+def hash_file_content(file_path: Path, hasher) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Hash the content of one file, returns (hex digest, None) or (None, error message)
+
+    Module-level (not a method) so it can run in multiprocessing worker processes.
+    """
+    try:
+        with open(file_path, "rb", buffering=0) as f:
+            # Tell the kernel we read front to back so it prefetches ahead (Linux)
+            if hasattr(os, "posix_fadvise"):
+                os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+
+            if os.fstat(f.fileno()).st_size > MMAP_MIN_SIZE:
+                # The hasher reads straight from the mapped page cache (no per-chunk copies)
+                file_hash = hasher()
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    if hasattr(mmap, "MADV_SEQUENTIAL"):
+                        mapped.madvise(mmap.MADV_SEQUENTIAL)
+                    file_hash.update(mapped)
+            else:
+                file_hash = hasher()
+                while chunk := f.read(HASH_CHUNK_SIZE):
+                    file_hash.update(chunk)
+
+            # The file won't be read again: let the kernel drop its cached pages
+            # instead of evicting other programs' data (Linux)
+            if hasattr(os, "posix_fadvise"):
+                os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+            return file_hash.hexdigest(), None
+    except (OSError, PermissionError) as e:
+        return None, str(e)
+
+
+def _console_safe(text: str) -> str:
+    """Replace characters stdout's encoding can't show (e.g. in filenames) with '?'"""
+    encoding = sys.stdout.encoding or 'utf-8'
+    return text.encode(encoding, errors='replace').decode(encoding)
+
 
 class DuplicateFileDetector:
     """Detects and manages duplicate files based on content"""
 
-    def __init__(self, search_dir: str, output_dir: str = None):
+    def __init__(self, search_dir: str, output_dir: str = None, legacy_md5: bool = False):
         self.search_dir = Path(search_dir)
+        # MD5 is slower than BLAKE3/SHA-256; only use it to compare with old reports
+        self.hasher = hashlib.md5 if legacy_md5 else _file_hasher
         self.output_dir = Path(output_dir) if output_dir else self.search_dir.parent / "output"
         self.output_dir.mkdir(exist_ok=True)
 
@@ -32,62 +123,201 @@ class DuplicateFileDetector:
             'space_recovered': 0
         }
 
-    def calculate_file_hash(self, file_path: Path) -> str:
-        """Calculate MD5 hash of file content"""
-        hash_md5 = hashlib.md5()
+    def calculate_file_hash(self, file_path: Path) -> Optional[str]:
+        """Calculate hash of file content (BLAKE3 or SHA-256, MD5 in legacy mode)"""
+        file_hash, error = hash_file_content(file_path, self.hasher)
+        if error:
+            print(f"  Warning: Cannot read {file_path.name}: {error}")
+        return file_hash
+
+    def calculate_quick_hash(self, file_path: Path) -> Optional[int]:
+        """Calculate a fast non-cryptographic hash of the first 4 KiB only (cheap pre-filter)"""
         try:
             with open(file_path, "rb") as f:
-                # Read file in chunks to handle large files
-                for chunk in iter(lambda: f.read(4096), b""):
-                    hash_md5.update(chunk)
-            return hash_md5.hexdigest()
+                return _quick_digest(f.read(QUICK_HASH_BYTES))
         except (OSError, PermissionError) as e:
             print(f"  Warning: Cannot read {file_path.name}: {e}")
             return None
 
+    def _walk(self, directory, recursive: bool):
+        """Yield a DirEntry for every file in directory (and its subdirectories if recursive)"""
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if recursive:
+                        yield from self._walk(entry.path, recursive)
+                elif entry.is_file():
+                    yield entry
+
+    def _prefetch(self, file_infos):
+        """
+        Ask the kernel to start reading files before they are hashed (Linux)
+
+        POSIX_FADV_WILLNEED queues asynchronous readahead for every file at
+        once, so the disk works on many requests in parallel while the
+        hashing loop catches up. Stops at PREFETCH_MAX_BYTES to avoid
+        pushing other programs' data out of the page cache.
+        """
+        if not hasattr(os, "posix_fadvise"):
+            return
+
+        queued_bytes = 0
+        for file_info in file_infos:
+            queued_bytes += file_info.size
+            if queued_bytes > PREFETCH_MAX_BYTES:
+                break
+            try:
+                fd = os.open(file_info.path, os.O_RDONLY)
+                try:
+                    os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+                finally:
+                    os.close(fd)
+            except OSError:
+                # Unreadable files are reported by calculate_file_hash
+                pass
+
+    def _hash_files(self, hash_func, file_infos):
+        """
+        Yield (file_info, hash) for each file, in the original order
+
+        hashlib releases the GIL while hashing large buffers, so threads can
+        read and hash several files at the same time.
+        """
+        paths = [file_info.path for file_info in file_infos]
+        if len(paths) < PARALLEL_MIN_FILES:
+            hashes = map(hash_func, paths)
+            yield from zip(file_infos, hashes)
+            return
+
+        with ThreadPoolExecutor(max_workers=MAX_HASH_WORKERS) as executor:
+            yield from zip(file_infos, executor.map(hash_func, paths))
+
+    def _hash_files_adaptive(self, file_infos):
+        """
+        Yield (file_info, full hash) for each file, in the original order
+
+        The first files are hashed in threads while measuring throughput. When
+        hashing turns out to be CPU-bound (files already cached in memory), the
+        rest is hashed in a multiprocessing pool to use every core; otherwise
+        the thread pool keeps going, which is best when waiting on the disk.
+        """
+        probe = file_infos[:PROCESS_POOL_PROBE_FILES]
+        rest = file_infos[PROCESS_POOL_PROBE_FILES:]
+
+        started = time.perf_counter()
+        yield from self._hash_files(self.calculate_file_hash, probe)
+        elapsed = time.perf_counter() - started
+
+        if not rest:
+            return
+
+        workers = os.cpu_count() or 1
+        probe_bytes = sum(file_info.size for file_info in probe)
+        throughput = probe_bytes / max(elapsed, 1e-9)
+        if workers < 2 or len(rest) < PARALLEL_MIN_FILES or throughput < CPU_BOUND_MIN_THROUGHPUT:
+            yield from self._hash_files(self.calculate_file_hash, rest)
+            return
+
+        # Give each worker about one second of files per task to keep IPC overhead low
+        files_per_second = throughput / max(probe_bytes / len(probe), 1)
+        chunksize = max(1, min(int(files_per_second), len(rest) // workers))
+
+        print(f"  Hashing is CPU-bound, using {workers} processes...")
+        worker = functools.partial(hash_file_content, hasher=self.hasher)
+        paths = [file_info.path for file_info in rest]
+        with multiprocessing.Pool(workers) as pool:
+            results = pool.imap(worker, paths, chunksize=chunksize)
+            for file_info, (file_hash, error) in zip(rest, results):
+                if error:
+                    print(f"  Warning: Cannot read {file_info.path.name}: {error}")
+                yield file_info, file_hash
+
     def scan_for_duplicates(self, include_subdirs: bool = True):
-        """Scan directory for duplicate files"""
+        """
+        Scan directory for duplicate files
+
+        Works in three stages so most files are never fully read:
+        1. Group by size - a file with a unique size can't have a duplicate
+        2. Group same-size files by a hash of their first 4 KiB
+        3. Hash the full content of files that still match
+        """
         print(f"Scanning for duplicates in: {self.search_dir}")
         print(f"Include subdirectories: {include_subdirs}")
 
         # Get all files
-        if include_subdirs:
-            files = [f for f in self.search_dir.rglob('*') if f.is_file()]
-        else:
-            files = [f for f in self.search_dir.iterdir() if f.is_file()]
+        files = list(self._walk(self.search_dir, include_subdirs))
 
         self.stats['total_files'] = len(files)
         print(f"Found {len(files)} files to analyze...")
 
-        # Calculate hash for each file
-        for i, file_path in enumerate(files, 1):
-            if i % 10 == 0 or i == len(files):
-                print(f"  Processing file {i}/{len(files)}...")
-
-            file_hash = self.calculate_file_hash(file_path)
-            if file_hash:
-                file_info = {
-                    'path': file_path,
-                    'size': file_path.stat().st_size,
-                    'modified': datetime.fromtimestamp(file_path.stat().st_mtime)
-                }
+        # Stage 1: group by size (DirEntry.stat() reuses data from the directory read)
+        # A size seen once is only remembered; it becomes a bucket on the second file
+        size_first_seen = {}
+        size_buckets = {}
+        for entry in files:
+            file_stat = entry.stat()
+            # mtime is the raw timestamp; converted to a datetime only when displayed
+            file_info = FileInfo(Path(entry.path), file_stat.st_size, file_stat.st_mtime)
+            size = file_stat.st_size
+            if size in size_buckets:
+                size_buckets[size].append(file_info)
+            elif size in size_first_seen:
+                size_buckets[size] = [size_first_seen.pop(size), file_info]
+            else:
+                size_first_seen[size] = file_info
+        del size_first_seen
+
+        candidates = [file_info for same_size in size_buckets.values() for file_info in same_size]
+        print(f"  {len(candidates)} files share their size with another file")
+
+        # Stage 2: group same-size files by a quick hash of their first bytes
+        quick_buckets = defaultdict(list)
+        for file_info, quick_hash in self._hash_files(self.calculate_quick_hash, candidates):
+            if quick_hash is not None:
+                quick_buckets[(file_info.size, quick_hash)].append(file_info)
+
+        to_hash = [
+            file_info
+            for same_start in quick_buckets.values() if len(same_start) > 1
+            for file_info in same_start
+        ]
+
+        # Stage 3: full content hash for the remaining candidates
+        # (results are merged here on the main thread)
+        self._prefetch(to_hash)
+        hashed = self._hash_files_adaptive(to_hash)
+        # Same idea as stage 1: a hash seen once is only remembered, so
+        # self.file_hashes ends up holding duplicate groups only
+        hash_first_seen = {}
+        self.file_hashes = defaultdict(list)
+        for i, (file_info, file_hash) in enumerate(hashed, 1):
+            if i % 10 == 0 or i == len(to_hash):
+                print(f"  Hashing file {i}/{len(to_hash)}...")
+
+            if not file_hash:
+                continue
+            if file_hash in self.file_hashes:
                 self.file_hashes[file_hash].append(file_info)
+            elif file_hash in hash_first_seen:
+                self.file_hashes[file_hash] = [hash_first_seen.pop(file_hash), file_info]
+            else:
+                hash_first_seen[file_hash] = file_info
+        del hash_first_seen
 
-        # Identify duplicates (groups with more than one file)
-        self.duplicates = {
-            hash_val: files
-            for hash_val, files in self.file_hashes.items()
-            if len(files) > 1
-        }
+        self.duplicates = self.file_hashes
+
+        # Sort each group by modification date (oldest first) once, for all reports
+        for files in self.duplicates.values():
+            files.sort(key=attrgetter('mtime'))
 
         # Update statistics
-        self.stats['unique_files'] = len(self.file_hashes)
         self.stats['duplicate_groups'] = len(self.duplicates)
         self.stats['total_duplicates'] = sum(len(files) - 1 for files in self.duplicates.values())
+        self.stats['unique_files'] = self.stats['total_files'] - self.stats['total_duplicates']
 
         # Calculate wasted space (size of all duplicates except one original per group)
         for files in self.duplicates.values():
-            file_size = files[0]['size']  # All files in group have same size
+            file_size = files[0].size  # All files in group have same size
             duplicate_count = len(files) - 1  # Exclude one original
             self.stats['space_wasted'] += file_size * duplicate_count
 
@@ -107,51 +337,65 @@ class DuplicateFileDetector:
 
     def print_duplicate_report(self):
         """Print detailed duplicate file report"""
-        print("\n" + "=" * 70)
-        print("DUPLICATE FILE ANALYSIS REPORT")
-        print("=" * 70)
+        # Collect the whole report and write it to the console in one go
+        out = io.StringIO()
+        self._write_report(out)
+        sys.stdout.write(_console_safe(out.getvalue()))
+        sys.stdout.flush()
+
+    def _write_report(self, out):
+        """Write the console duplicate report to a text stream"""
+        print("\n" + "=" * 70, file=out)
+        print("DUPLICATE FILE ANALYSIS REPORT", file=out)
+        print("=" * 70, file=out)
 
         summary = self.get_duplicate_summary()
 
-        print(f"\nSUMMARY:")
-        print(f"  Total files scanned: {summary['total_files']:,}")
-        print(f"  Unique files: {summary['unique_files']:,}")
-        print(f"  Duplicate groups found: {summary['duplicate_groups']:,}")
-        print(f"  Total duplicate files: {summary['total_duplicates']:,}")
-        print(f"  Wasted storage space: {summary['space_wasted_mb']:.2f} MB")
-        print(f"  Largest duplicate group: {summary['largest_duplicate_group']} files")
+        print(f"\nSUMMARY:", file=out)
+        print(f"  Total files scanned: {summary['total_files']:,}", file=out)
+        print(f"  Unique files: {summary['unique_files']:,}", file=out)
+        print(f"  Duplicate groups found: {summary['duplicate_groups']:,}", file=out)
+        print(f"  Total duplicate files: {summary['total_duplicates']:,}", file=out)
+        print(f"  Wasted storage space: {summary['space_wasted_mb']:.2f} MB", file=out)
+        print(f"  Largest duplicate group: {summary['largest_duplicate_group']} files", file=out)
 
         if not self.duplicates:
-            print("\nNo duplicate files found!")
+            print("\nNo duplicate files found!", file=out)
             return
 
-        print(f"\nDETAILED DUPLICATE GROUPS:")
-        print("-" * 70)
+        print(f"\nDETAILED DUPLICATE GROUPS:", file=out)
+        print("-" * 70, file=out)
 
         for i, (file_hash, files) in enumerate(self.duplicates.items(), 1):
-            file_size = files[0]['size']
+            file_size = files[0].size
             duplicate_count = len(files) - 1
             wasted_space = file_size * duplicate_count
 
-            print(f"\nGroup {i}: {len(files)} identical files")
-            print(f"  File size: {file_size:,} bytes ({file_size / 1024:.1f} KB)")
-            print(f"  Wasted space: {wasted_space:,} bytes ({wasted_space / 1024:.1f} KB)")
-            print(f"  Hash: {file_hash}")
-            print(f"  Files:")
-
-            # Sort by modification date (oldest first)
-            sorted_files = sorted(files, key=lambda x: x['modified'])
+            print(f"\nGroup {i}: {len(files)} identical files", file=out)
+            print(f"  File size: {file_size:,} bytes ({file_size / 1024:.1f} KB)", file=out)
+            print(f"  Wasted space: {wasted_space:,} bytes ({wasted_space / 1024:.1f} KB)", file=out)
+            print(f"  Hash: {file_hash}", file=out)
+            print(f"  Files:", file=out)
 
-            for j, file_info in enumerate(sorted_files):
+            # Groups are already sorted by modification date (oldest first)
+            for j, file_info in enumerate(files):
+                modified = datetime.fromtimestamp(file_info.mtime)
                 marker = "[ORIGINAL]" if j == 0 else "[DUPLICATE]"
-                try:
-                    print(f"    {marker} {file_info['path'].name}")
-                    print(f"              Path: {file_info['path']}")
-                    print(f"              Modified: {file_info['modified'].strftime('%Y-%m-%d %H:%M:%S')}")
-                except UnicodeEncodeError:
-                    print(f"    {marker} [Unicode filename]")
-                    print(f"              Path: [Unicode path]")
-                    print(f"              Modified: {file_info['modified'].strftime('%Y-%m-%d %H:%M:%S')}")
+                print(f"    {marker} {file_info.path.name}", file=out)
+                print(f"              Path: {file_info.path}", file=out)
+                print(f"              Modified: {modified.strftime('%Y-%m-%d %H:%M:%S')}", file=out)
+
+    @staticmethod
+    def _delete_file(file_info: FileInfo, use_trash: bool):
+        """Delete or trash one file, returns (file_info, action, error)"""
+        try:
+            if use_trash:
+                send2trash.send2trash(str(file_info.path))
+                return file_info, "moved to trash", None
+            file_info.path.unlink()
+            return file_info, "deleted permanently", None
+        except Exception as e:
+            return file_info, None, e
 
     def delete_duplicates(self, keep_oldest: bool = True, use_trash: bool = True):
         """Delete duplicate files, keeping one copy"""
@@ -166,51 +410,37 @@ class DuplicateFileDetector:
         deleted_files = []
         total_space_recovered = 0
 
+        # First decide what to delete in every group, then delete everything at once
+        to_delete = []
         for file_hash, files in self.duplicates.items():
-            # Sort files by modification date
-            sorted_files = sorted(files, key=lambda x: x['modified'])
-
-            # Choose which file to keep
+            # Choose which file to keep (groups are sorted by modification date)
             if keep_oldest:
-                keep_file = sorted_files[0]
-                delete_files = sorted_files[1:]
+                keep_file = files[0]
+                delete_files = files[1:]
             else:
-                keep_file = sorted_files[-1]
-                delete_files = sorted_files[:-1]
+                keep_file = files[-1]
+                delete_files = files[:-1]
 
             print(f"\nProcessing group with {len(files)} files:")
-            try:
-                print(f"  Keeping: {keep_file['path'].name}")
-            except UnicodeEncodeError:
-                print(f"  Keeping: [Unicode filename]")
+            print(_console_safe(f"  Keeping: {keep_file.path.name}"))
 
-            # Delete duplicate files
-            for file_info in delete_files:
-                try:
-                    file_path = file_info['path']
-                    file_size = file_info['size']
-
-                    if use_trash:
-                        send2trash.send2trash(str(file_path))
-                        action = "moved to trash"
-                    else:
-                        file_path.unlink()
-                        action = "deleted permanently"
-
-                    deleted_files.append(file_info)
-                    total_space_recovered += file_size
-                    self.stats['files_deleted'] += 1
-
-                    try:
-                        print(f"    Deleted: {file_path.name} ({action})")
-                    except UnicodeEncodeError:
-                        print(f"    Deleted: [Unicode filename] ({action})")
-
-                except Exception as e:
-                    try:
-                        print(f"    Error deleting {file_path.name}: {e}")
-                    except UnicodeEncodeError:
-                        print(f"    Error deleting [Unicode filename]: {e}")
+            to_delete.extend(delete_files)
+
+        # Delete duplicate files in parallel; results are counted here on the main thread
+        print(f"\nDeleting {len(to_delete)} duplicate files...")
+        delete_one = functools.partial(self._delete_file, use_trash=use_trash)
+        with ThreadPoolExecutor(max_workers=DELETE_WORKERS) as executor:
+            for file_info, action, error in executor.map(delete_one, to_delete):
+                file_path = file_info.path
+                if error:
+                    print(_console_safe(f"    Error deleting {file_path.name}: {error}"))
+                    continue
+
+                deleted_files.append(file_info)
+                total_space_recovered += file_info.size
+                self.stats['files_deleted'] += 1
+
+                print(_console_safe(f"    Deleted: {file_path.name} ({action})"))
 
         self.stats['space_recovered'] = total_space_recovered
 
@@ -228,48 +458,45 @@ class DuplicateFileDetector:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             report_path = self.output_dir / f"duplicate_report_{timestamp}.txt"
 
-        report = []
-        report.append("DUPLICATE FILE ANALYSIS REPORT")
-        report.append("=" * 50)
-        report.append(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        report.append(f"Search Directory: {self.search_dir}")
-        report.append("")
-
-        # Summary
-        summary = self.get_duplicate_summary()
-        report.append("SUMMARY:")
-        report.append(f"  Total files scanned: {summary['total_files']:,}")
-        report.append(f"  Unique files: {summary['unique_files']:,}")
-        report.append(f"  Duplicate groups: {summary['duplicate_groups']:,}")
-        report.append(f"  Total duplicates: {summary['total_duplicates']:,}")
-        report.append(f"  Wasted space: {summary['space_wasted_mb']:.2f} MB")
-        report.append("")
-
-        # Detailed groups
-        if self.duplicates:
-            report.append("DUPLICATE GROUPS:")
-            report.append("-" * 30)
-
-            for i, (file_hash, files) in enumerate(self.duplicates.items(), 1):
-                file_size = files[0]['size']
-                wasted_space = file_size * (len(files) - 1)
-
-                report.append(f"\nGroup {i}: {len(files)} files")
-                report.append(f"  Size: {file_size:,} bytes")
-                report.append(f"  Wasted: {wasted_space:,} bytes")
-                report.append(f"  Hash: {file_hash}")
-
-                sorted_files = sorted(files, key=lambda x: x['modified'])
-                for j, file_info in enumerate(sorted_files):
-                    marker = "[KEEP]" if j == 0 else "[DELETE]"
-                    report.append(f"    {marker} {file_info['path']}")
-                    report.append(f"         Modified: {file_info['modified']}")
-        else:
-            report.append("No duplicates found.")
-
-        # Write report
-        with open(report_path, 'w', encoding='utf-8') as f:
-            f.write('\n'.join(report))
+        # Write the report line by line (the 1 MiB file buffer batches the writes)
+        with open(report_path, 'w', encoding='utf-8', buffering=1024 * 1024) as f:
+            w = f.write
+            w("DUPLICATE FILE ANALYSIS REPORT\n")
+            w("=" * 50 + "\n")
+            w(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+            w(f"Search Directory: {self.search_dir}\n")
+            w("\n")
+
+            # Summary
+            summary = self.get_duplicate_summary()
+            w("SUMMARY:\n")
+            w(f"  Total files scanned: {summary['total_files']:,}\n")
+            w(f"  Unique files: {summary['unique_files']:,}\n")
+            w(f"  Duplicate groups: {summary['duplicate_groups']:,}\n")
+            w(f"  Total duplicates: {summary['total_duplicates']:,}\n")
+            w(f"  Wasted space: {summary['space_wasted_mb']:.2f} MB\n")
+            w("\n")
+
+            # Detailed groups
+            if self.duplicates:
+                w("DUPLICATE GROUPS:\n")
+                w("-" * 30 + "\n")
+
+                for i, (file_hash, files) in enumerate(self.duplicates.items(), 1):
+                    file_size = files[0].size
+                    wasted_space = file_size * (len(files) - 1)
+
+                    w(f"\nGroup {i}: {len(files)} files\n")
+                    w(f"  Size: {file_size:,} bytes\n")
+                    w(f"  Wasted: {wasted_space:,} bytes\n")
+                    w(f"  Hash: {file_hash}\n")
+
+                    for j, file_info in enumerate(files):
+                        marker = "[KEEP]" if j == 0 else "[DELETE]"
+                        w(f"    {marker} {file_info.path}\n")
+                        w(f"         Modified: {datetime.fromtimestamp(file_info.mtime)}\n")
+            else:
+                w("No duplicates found.\n")
 
         print(f"Report exported: {report_path}")
         return report_path
@@ -302,6 +529,10 @@ class DuplicateFileDetector:
 
 def main():
     """Main function to demonstrate duplicate detection"""
+    # Filenames the console can't show are printed with '?' instead of raising
+    if hasattr(sys.stdout, 'reconfigure'):
+        sys.stdout.reconfigure(encoding='utf-8', errors='replace')
+
     # Use sample_files as source
     search_path = Path(__file__).parent.parent / 'sample_files'
 
@@ -3,10 +3,22 @@ File Type Organizer - Automatically sort files by type into folders
 Organizes files based on their extensions into categorized folders
 """
 
+import functools
+import logging
+import os
 import shutil
+import sys
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
+# Moving/copying is mostly waiting on the disk, so several files are transferred at once
+DEFAULT_MAX_CONCURRENCY = 8
+
+# Per-file lines are logged at DEBUG (hidden by default); errors at WARNING
+logger = logging.getLogger(__name__)
+
 
 class FileTypeOrganizer:
     """Organizes files by type into categorized folders"""
@@ -59,7 +71,28 @@ class FileTypeOrganizer:
             }
         }
 
+        # Extension lists become frozensets so membership tests are O(1)
+        for info in self.file_categories.values():
+            info['extensions'] = frozenset(info['extensions'])
+
+        # Flat extension -> category table, so each lookup is a single dict probe
+        self._ext_to_category = {
+            ext: category
+            for category, info in self.file_categories.items()
+            for ext in info['extensions']
+        }
+
+        # Category folder paths, filled in by create_category_folders
+        self._category_paths = {}
+        self._category_paths_str = {}
+
+        # Whether source and output share a filesystem (checked in organize_files)
+        self._same_device = False
+
         self.moved_files = []
+        # Per-category counts and file records, kept up to date as files are organized
+        self._category_counts = Counter()
+        self._by_category = defaultdict(list)
         self.stats = {
             'total_files': 0,
             'moved_files': 0,
@@ -67,28 +100,84 @@ class FileTypeOrganizer:
             'categories_used': set()
         }
 
-    def get_file_category(self, file_path: Path) -> str:
-        """Determine the category for a file based on its extension"""
-        extension = file_path.suffix.lower()
-
-        for category, info in self.file_categories.items():
-            if extension in info['extensions']:
-                return category
-
-        return 'Other'
+    def get_file_category(self, extension: str) -> str:
+        """Determine the category for a file based on its (lowercase) extension"""
+        return self._ext_to_category.get(extension, 'Other')
 
     def create_category_folders(self):
         """Create folders for each file category"""
         print("Creating category folders...")
 
-        for category in self.file_categories.keys():
-            category_path = self.output_dir / category
+        # Folder paths are built once per run and reused for every file
+        self._category_paths = {category: self.output_dir / category for category in self.file_categories}
+        self._category_paths_str = {category: str(path) for category, path in self._category_paths.items()}
+
+        for category_path in self._category_paths.values():
             category_path.mkdir(parents=True, exist_ok=True)
 
         print(f"Category folders created in: {self.output_dir}")
 
-    def organize_files(self, move_files: bool = True):
-        """Organize files by type into category folders"""
+    @staticmethod
+    def _reserve_name(dest_folder: str, name: str) -> str:
+        """
+        Claim a free file name in dest_folder, returns its path
+
+        os.open with O_CREAT | O_EXCL creates an empty placeholder only if the
+        name is free, so checking and claiming a name is one atomic syscall
+        (no race with other transfers); the file then replaces the placeholder.
+        On a conflict, "_1", "_2", ... is added before the extension.
+        """
+        dest_path = os.path.join(dest_folder, name)
+        stem, suffix = os.path.splitext(name)
+        counter = 1
+        while True:
+            try:
+                fd = os.open(dest_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+            except FileExistsError:
+                dest_path = os.path.join(dest_folder, f"{stem}_{counter}{suffix}")
+                counter += 1
+                continue
+            os.close(fd)
+            return dest_path
+
+    def _transfer_file(self, src: str, dest_path: str, move_files: bool, preserve_metadata: bool):
+        """Move or copy one file, returns the operation name"""
+        if move_files:
+            if self._same_device:
+                # Same filesystem: a rename is one syscall, whatever the file size
+                os.replace(src, dest_path)
+            else:
+                shutil.move(src, dest_path)
+            return "moved"
+        if preserve_metadata:
+            shutil.copy2(src, dest_path)
+        else:
+            # Content only: skips the timestamp/permission syscalls, and the data is
+            # copied in the kernel (copy_file_range/sendfile) where available
+            shutil.copyfile(src, dest_path)
+        return "copied"
+
+    def _try_transfer(self, plan, move_files: bool, preserve_metadata: bool):
+        """Transfer one planned (entry, category, dest_path) in a worker thread, returns (operation, error)"""
+        entry, _, dest_path = plan
+        try:
+            return self._transfer_file(entry.path, dest_path, move_files, preserve_metadata), None
+        except Exception as e:
+            # Release the reserved name
+            try:
+                os.unlink(dest_path)
+            except OSError:
+                pass
+            return None, e
+
+    def organize_files(self, move_files: bool = True, max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                       preserve_metadata: bool = False):
+        """
+        Organize files by type into category folders
+
+        In copy mode only the file content is copied, unless preserve_metadata
+        is set (then timestamps and permissions are copied too, like shutil.copy2).
+        """
         print(f"\nStarting file organization...")
         print(f"Source directory: {self.source_dir}")
         print(f"Output directory: {self.output_dir}")
@@ -96,103 +185,100 @@ class FileTypeOrganizer:
 
         # Create category folders
         self.create_category_folders()
+        self._same_device = os.stat(self.source_dir).st_dev == os.stat(self.output_dir).st_dev
 
-        # Get all files in source directory
-        files = [f for f in self.source_dir.iterdir() if f.is_file()]
+        # Get all files in source directory (DirEntry.is_file() reuses data from the directory read)
+        with os.scandir(self.source_dir) as entries:
+            files = [entry for entry in entries if entry.is_file(follow_symlinks=False)]
         self.stats['total_files'] = len(files)
 
         print(f"\nProcessing {len(files)} files...")
 
-        for file_path in files:
+        # Reserve every destination name first, then transfer the files
+        planned = []
+        for entry in files:
+            # Determine category
+            category = self.get_file_category(os.path.splitext(entry.name)[1].lower())
+
             try:
-                # Determine category
-                category = self.get_file_category(file_path)
-                self.stats['categories_used'].add(category)
+                dest_path = self._reserve_name(self._category_paths_str[category], entry.name)
+            except OSError as e:
+                logger.warning("  Error processing %s: %s", entry.name, e)
+                self.stats['skipped_files'] += 1
+                continue
+
+            planned.append((entry, category, dest_path))
+
+        # Move or copy the files in parallel; results are recorded here on the main thread
+        with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+            transfer = functools.partial(
+                self._try_transfer, move_files=move_files, preserve_metadata=preserve_metadata
+            )
+            results = executor.map(transfer, planned)
+            for (entry, category, dest_path), (operation, error) in zip(planned, results):
+                if error:
+                    logger.warning("  Error processing %s: %s", entry.name, error)
+                    self.stats['skipped_files'] += 1
+                    continue
 
-                # Create destination path
-                dest_folder = self.output_dir / category
-                dest_path = dest_folder / file_path.name
-
-                # Handle filename conflicts
-                counter = 1
-                original_dest = dest_path
-                while dest_path.exists():
-                    stem = original_dest.stem
-                    suffix = original_dest.suffix
-                    dest_path = dest_folder / f"{stem}_{counter}{suffix}"
-                    counter += 1
-
-                # Move or copy the file
-                if move_files:
-                    shutil.move(str(file_path), str(dest_path))
-                    operation = "moved"
-                else:
-                    shutil.copy2(str(file_path), str(dest_path))
-                    operation = "copied"
+                self.stats['categories_used'].add(category)
 
                 # Record the operation
-                self.moved_files.append({
-                    'original_path': file_path,
-                    'new_path': dest_path,
+                file_info = {
+                    'original_path': Path(entry.path),
+                    'new_path': Path(dest_path),
                     'category': category,
                     'operation': operation
-                })
+                }
+                self.moved_files.append(file_info)
+                self._category_counts[category] += 1
+                self._by_category[category].append(file_info)
 
                 self.stats['moved_files'] += 1
-                try:
-                    print(f"  {operation.capitalize()}: {file_path.name} -> {category}/{dest_path.name}")
-                except UnicodeEncodeError:
-                    print(f"  {operation.capitalize()}: [Unicode filename] -> {category}/[Unicode filename]")
-
-            except Exception as e:
-                try:
-                    print(f"  Error processing {file_path.name}: {e}")
-                except UnicodeEncodeError:
-                    print(f"  Error processing [Unicode filename]: {e}")
-                self.stats['skipped_files'] += 1
+                logger.debug("  %s: %s -> %s/%s", operation.capitalize(), entry.name, category,
+                             file_info['new_path'].name)
 
-    def generate_report(self) -> str:
-        """Generate a summary report of the organization process"""
-        report = []
-        report.append("FILE ORGANIZATION REPORT")
-        report.append("=" * 50)
-        report.append(f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        report.append(f"Source Directory: {self.source_dir}")
-        report.append(f"Output Directory: {self.output_dir}")
-        report.append("")
+    def _report_lines(self):
+        """Yield the lines of the organization report one by one"""
+        stats = self.stats
+        moved_files = stats['moved_files']
+
+        yield "FILE ORGANIZATION REPORT"
+        yield "=" * 50
+        yield f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+        yield f"Source Directory: {self.source_dir}"
+        yield f"Output Directory: {self.output_dir}"
+        yield ""
 
         # Summary statistics
-        report.append("SUMMARY:")
-        report.append(f"  Total files processed: {self.stats['total_files']}")
-        report.append(f"  Files successfully organized: {self.stats['moved_files']}")
-        report.append(f"  Files skipped (errors): {self.stats['skipped_files']}")
-        report.append(f"  Categories used: {len(self.stats['categories_used'])}")
-        report.append("")
+        yield "SUMMARY:"
+        yield f"  Total files processed: {stats['total_files']}"
+        yield f"  Files successfully organized: {moved_files}"
+        yield f"  Files skipped (errors): {stats['skipped_files']}"
+        yield f"  Categories used: {len(stats['categories_used'])}"
+        yield ""
 
         # Category breakdown
-        category_counts = {}
-        for file_info in self.moved_files:
-            category = file_info['category']
-            category_counts[category] = category_counts.get(category, 0) + 1
-
-        report.append("CATEGORY BREAKDOWN:")
-        for category, count in sorted(category_counts.items()):
+        yield "CATEGORY BREAKDOWN:"
+        for category, count in sorted(self._category_counts.items()):
             description = self.file_categories[category]['description']
-            percentage = (count / self.stats['moved_files'] * 100) if self.stats['moved_files'] > 0 else 0
-            report.append(f"  {category:15s}: {count:3d} files ({percentage:5.1f}%) - {description}")
+            percentage = (count / moved_files * 100) if moved_files > 0 else 0
+            yield f"  {category:15s}: {count:3d} files ({percentage:5.1f}%) - {description}"
 
-        report.append("")
+        yield ""
 
-        # Detailed file list
-        report.append("DETAILED FILE LIST:")
-        for category in sorted(self.stats['categories_used']):
-            category_files = [f for f in self.moved_files if f['category'] == category]
+        # Detailed file list (files are already grouped by category)
+        yield "DETAILED FILE LIST:"
+        for category in sorted(stats['categories_used']):
+            category_files = self._by_category.get(category)
             if category_files:
-                report.append(f"\n{category}:")
+                yield f"\n{category}:"
                 for file_info in category_files:
-                    report.append(f"  {file_info['original_path'].name} -> {file_info['new_path'].name}")
+                    yield f"  {file_info['original_path'].name} -> {file_info['new_path'].name}"
 
-        return "\n".join(report)
+    def generate_report(self) -> str:
+        """Generate a summary report of the organization process"""
+        return "\n".join(self._report_lines())
 
     def save_report(self, report_path: str = None):
         """Save the organization report to a file"""
@@ -200,10 +286,9 @@ class FileTypeOrganizer:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             report_path = self.output_dir.parent / f"organization_report_{timestamp}.txt"
 
-        report_content = self.generate_report()
-
+        # Lines are streamed to the file instead of building the whole report string
         with open(report_path, 'w', encoding='utf-8') as f:
-            f.write(report_content)
+            f.writelines(f"{line}\n" for line in self._report_lines())
 
         print(f"\nReport saved: {report_path}")
         return report_path
@@ -222,18 +307,19 @@ class FileTypeOrganizer:
         if self.stats['categories_used']:
             print(f"\nCategories created:")
             for category in sorted(self.stats['categories_used']):
-                count = len([f for f in self.moved_files if f['category'] == category])
-                print(f"  {category}: {count} files")
+                print(f"  {category}: {self._category_counts[category]} files")
 
         print(f"\nOrganized files location: {self.output_dir}")
 
-    def run_organization(self, move_files: bool = True, save_report: bool = True):
+    def run_organization(self, move_files: bool = True, save_report: bool = True,
+                         max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                         preserve_metadata: bool = False):
         """Run the complete file organization process"""
         print("STARTING FILE TYPE ORGANIZATION")
         print("=" * 60)
 
         # Organize files
-        self.organize_files(move_files)
+        self.organize_files(move_files, max_concurrency, preserve_metadata)
 
         # Print summary
         self.print_summary()
@@ -245,6 +331,12 @@ class FileTypeOrganizer:
 
 def main():
     """Main function to demonstrate file organization"""
+    # Filenames the console can't show are printed with '?' instead of raising
+    if hasattr(sys.stdout, 'reconfigure'):
+        sys.stdout.reconfigure(encoding='utf-8', errors='replace')
+    # Use level=logging.DEBUG to see every moved/copied file
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
     # Use sample_files as source
     source_path = Path(__file__).parent.parent / 'sample_files'
 
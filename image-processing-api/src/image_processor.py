@@ -3,13 +3,21 @@ Image Processing Functions
 Handles image resizing and grayscale conversion using Pillow
 """
 
-import uuid
-from datetime import datetime
+import heapq
+import io
+import os
+import time
 from pathlib import Path
-from typing import Tuple
+from typing import BinaryIO, Tuple
 
 from PIL import Image, ImageOps
 
+# Supported image formats (content types), shared by every processor instance
+SUPPORTED_FORMATS = frozenset({
+    'image/jpeg', 'image/jpg', 'image/png',
+    'image/gif', 'image/bmp', 'image/webp'
+})
+
 
 class ImageProcessor:
     """Image processing utilities for the API"""
@@ -19,33 +27,24 @@ class ImageProcessor:
         self.processed_dir.mkdir(exist_ok=True)
 
         # Supported image formats
-        self.supported_formats = {
-            'image/jpeg', 'image/jpg', 'image/png',
-            'image/gif', 'image/bmp', 'image/webp'
-        }
+        self.supported_formats = SUPPORTED_FORMATS
 
     def is_valid_image_format(self, content_type: str) -> bool:
         """Check if the uploaded file is a supported image format"""
-        return content_type.lower() in self.supported_formats
+        return content_type.lower() in SUPPORTED_FORMATS
 
     def generate_unique_filename(self, original_filename: str) -> str:
         """Generate a unique filename for processed image"""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        unique_id = str(uuid.uuid4())[:8]
-
-        # Extract extension from original filename
-        original_path = Path(original_filename)
-        extension = original_path.suffix.lower()
-
-        # Default to .jpg if no extension
-        if not extension:
-            extension = '.jpg'
+        # Extract extension from original filename (default to .jpg if no extension)
+        extension = os.path.splitext(original_filename)[1].lower() or '.jpg'
 
-        return f"processed_{timestamp}_{unique_id}{extension}"
+        # Nanosecond timestamp keeps names in creation order; random hex makes them unique
+        return f"processed_{time.time_ns()}_{os.urandom(4).hex()}{extension}"
 
     def resize_image(self, image: Image.Image, size: Tuple[int, int] = (300, 300)) -> Image.Image:
         """
         Resize image to specified size while maintaining aspect ratio
+        (larger images are shrunk in place)
         
         Args:
             image: PIL Image object
@@ -54,24 +53,23 @@ class ImageProcessor:
         Returns:
             Resized PIL Image
         """
-        # Calculate aspect ratio
         original_width, original_height = image.size
         target_width, target_height = size
 
-        # Calculate scaling factor to maintain aspect ratio
-        scale_width = target_width / original_width
-        scale_height = target_height / original_height
-        scale = min(scale_width, scale_height)
-
-        # Calculate new dimensions
-        new_width = int(original_width * scale)
-        new_height = int(original_height * scale)
-
-        # Resize image
-        resized_image = image.resize((new_width, new_height), Image.Resampling.LANCZOS)
-
-        # Create a new image with target size and paste resized image in center
-        final_image = Image.new('RGB', size, color='white')
+        if original_width >= target_width or original_height >= target_height:
+            # Shrinking: thumbnail() resizes in place, keeps the aspect ratio and
+            # reduces the image cheaply before the final LANCZOS pass
+            image.thumbnail(size, Image.Resampling.LANCZOS)
+            resized_image = image
+        else:
+            # Small image: scale it up to fit, keeping the aspect ratio
+            scale = min(target_width / original_width, target_height / original_height)
+            new_size = (int(original_width * scale), int(original_height * scale))
+            resized_image = image.resize(new_size, Image.Resampling.LANCZOS)
+        new_width, new_height = resized_image.size
+
+        # Create a new image with target size (same mode) and paste resized image in center
+        final_image = Image.new(resized_image.mode, size, color='white')
         paste_x = (target_width - new_width) // 2
         paste_y = (target_height - new_height) // 2
         final_image.paste(resized_image, (paste_x, paste_y))
@@ -90,33 +88,36 @@ class ImageProcessor:
         """
         return ImageOps.grayscale(image)
 
-    def process_image(self, image_bytes: bytes, original_filename: str) -> dict:
+    def process_image(self, image_file: BinaryIO, original_filename: str) -> dict:
         """
         Complete image processing pipeline: resize and convert to grayscale
         
         Args:
-            image_bytes: Raw image bytes
+            image_file: Image data as a binary file-like object (such as BytesIO)
             original_filename: Original filename for reference
             
         Returns:
             dict: Processing results with file paths and metadata
         """
         try:
-            # Open image from bytes
-            image = Image.open(image_bytes)
-
-            # Convert to RGB if necessary (handles RGBA, P mode images)
-            if image.mode != 'RGB':
-                image = image.convert('RGB')
+            # Open image from the file object
+            image = Image.open(image_file)
 
-            # Get original dimensions
+            # Get original dimensions (before draft, which changes the reported size)
             original_width, original_height = image.size
 
-            # Resize image to 300x300
-            resized_image = self.resize_image(image, (300, 300))
+            # JPEG only: let the decoder scale down by 1/2, 1/4 or 1/8 while decoding
+            # (straight to grayscale), keeping at least 2x the target size so LANCZOS
+            # still has detail to work with
+            image.draft('L', (600, 600))
 
-            # Convert to grayscale
-            grayscale_image = self.convert_to_grayscale(resized_image)
+            # Convert to grayscale first (handles RGB, RGBA, P mode images), so the
+            # resize works on one channel instead of three
+            if image.mode != 'L':
+                image = self.convert_to_grayscale(image)
+
+            # Resize image to 300x300
+            grayscale_image = self.resize_image(image, (300, 300))
 
             # Generate unique filename
             processed_filename = self.generate_unique_filename(original_filename)
@@ -143,25 +144,26 @@ class ImageProcessor:
                 'original_filename': original_filename
             }
 
-    def get_image_info(self, image_bytes: bytes) -> dict:
+    def get_image_info(self, image_file: BinaryIO) -> dict:
         """
         Get metadata about an image without processing it
         
         Args:
-            image_bytes: Raw image bytes
+            image_file: Image data as a binary file-like object (such as BytesIO)
             
         Returns:
             dict: Image metadata
         """
         try:
-            image = Image.open(image_bytes)
-
-            return {
-                'format': image.format,
-                'mode': image.mode,
-                'size': {'width': image.width, 'height': image.height},
-                'has_transparency': image.mode in ('RGBA', 'LA') or 'transparency' in image.info
-            }
+            # Image.open only parses the header; pixels are never decoded here
+            # (no load/convert), and the file is closed as soon as we're done
+            with Image.open(image_file) as image:
+                return {
+                    'format': image.format,
+                    'mode': image.mode,
+                    'size': {'width': image.width, 'height': image.height},
+                    'has_transparency': image.mode in ('RGBA', 'LA') or 'transparency' in image.info
+                }
         except Exception as e:
             return {'error': str(e)}
 
@@ -173,19 +175,18 @@ class ImageProcessor:
             max_files: Maximum number of files to keep
         """
         try:
-            # Get all files in processed directory
-            files = list(self.processed_dir.glob('*'))
+            # Get all files in processed directory (DirEntry.stat() is cached per entry)
+            with os.scandir(self.processed_dir) as entries:
+                files = [entry for entry in entries if entry.is_file(follow_symlinks=False)]
 
-            if len(files) <= max_files:
+            extra_files = len(files) - max_files
+            if extra_files <= 0:
                 return
 
-            # Sort by modification time (oldest first)
-            files.sort(key=lambda x: x.stat().st_mtime)
-
-            # Remove oldest files
-            files_to_remove = files[:-max_files]
-            for file_path in files_to_remove:
-                file_path.unlink()
+            # Only the oldest files are needed, not a full sort
+            files_to_remove = heapq.nsmallest(extra_files, files, key=lambda entry: entry.stat().st_mtime)
+            for entry in files_to_remove:
+                os.unlink(entry.path)
 
         except Exception as e:
             print(f"Error during cleanup: {e}")
@@ -193,3 +194,12 @@ class ImageProcessor:
 
 # Global processor instance
 image_processor = ImageProcessor()
+
+
+def process_image_bytes(image_bytes: bytes, original_filename: str) -> dict:
+    """
+    Run process_image on raw bytes (module-level so it can run in a worker process)
+
+    Each worker process imports this module and gets its own image_processor.
+    """
+    return image_processor.process_image(io.BytesIO(image_bytes), original_filename)
